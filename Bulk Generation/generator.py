@@ -1,10 +1,22 @@
 import argparse
+import functools
 import itertools
+import multiprocessing
 import os
+import queue
+import random
 import subprocess
 import sys
+from collections import deque
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from tqdm import tqdm
+
+# Per-combo aria output when running with --spawn; not counted as a result.
+COMBO_LOG = "aria_stdout.log"
+# How long a pool worker waits to be handed a GPU id before giving up.
+GPU_CLAIM_TIMEOUT_S = 30.0
 
 
 def parse_args() -> argparse.Namespace:
@@ -77,13 +89,64 @@ def parse_args() -> argparse.Namespace:
         default=True,
         help="Skip a combo if its output folder already exists and is non-empty (default: on).",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of combos to generate concurrently (default: one per GPU with "
+        "torch_cuda, otherwise one per available CPU).",
+    )
+    p.add_argument(
+        "--gpus",
+        type=parse_gpu_ids,
+        default=None,
+        help="Comma-separated CUDA device ids to spread combos over, e.g. 0,2 "
+        "(default: every visible GPU).",
+    )
+    p.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Run each combo in its own `aria.run generate` subprocess instead of "
+        "loading the checkpoint once in-process.",
+    )
     return p.parse_args()
 
 
+def parse_gpu_ids(value: str) -> List[int]:
+    try:
+        ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated GPU ids, got {value!r}")
+    if not ids:
+        raise argparse.ArgumentTypeError("expected at least one GPU id")
+    return ids
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def is_nonempty_dir(path: Path) -> bool:
+    try:
+        with os.scandir(path) as it:
+            return any(entry.name != COMBO_LOG for entry in it)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def log_tail(path: Path, lines: int = 5, max_bytes: int = 4096) -> str:
+    """Last few lines of a combo log, read from the end of the file."""
+    try:
+        with path.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - max_bytes))
+            data = f.read()
+    except OSError:
+        return ""
+    tail = data.decode("utf-8", errors="replace").splitlines()[-lines:]
+    return "\n".join("    " + line for line in tail)
+
+
 def combo_name(temp: float, top_p: float, min_p: float) -> str:
     def fmt(x: float) -> str:
         return f"{x:.3g}".replace(".", "p")
@@ -91,111 +154,395 @@ def combo_name(temp: float, top_p: float, min_p: float) -> str:
     return f"t{fmt(temp)}_tp{fmt(top_p)}_mp{fmt(min_p)}"
 
 
-def run_combo(
-    prompt: Path,
-    checkpoint: Path,
-    out_dir: Path,
-    temp: float,
-    top_p: float,
-    min_p: float,
-    prompt_duration: float,
-    length: int,
-    variations: int,
-    device: str,
-) -> None:
-    ensure_dir(out_dir)
-    cmd: List[str] = [
+def aria_base_cmd(args: argparse.Namespace, checkpoint: Path) -> List[str]:
+    """The `aria.run generate` argv shared by every combo of a sweep."""
+    return [
         sys.executable,
         "-m",
         "aria.run",
         "generate",
         "--backend",
-        device,
+        args.device,
         "--checkpoint_path",
         str(checkpoint),
-        "--prompt_midi_path",
-        str(prompt),
         "--prompt_duration",
-        str(prompt_duration),
+        str(args.prompt_duration),
         "--variations",
-        str(variations),
+        str(args.variations),
+        "--length",
+        str(args.length),
+    ]
+
+
+def launch_combo(
+    base_cmd: Sequence[str],
+    prompt: Path,
+    out_dir: Path,
+    temp: float,
+    top_p: float,
+    min_p: float,
+    env: Optional[Dict[str, str]] = None,
+) -> subprocess.Popen:
+    # main() already created the prompt bucket; only the leaf is new.
+    out_dir.mkdir(exist_ok=True)
+    cmd: List[str] = [
+        *base_cmd,
+        "--prompt_midi_path",
+        str(prompt),
         "--temp",
         str(temp),
         "--top_p",
         str(top_p),
-        "--length",
-        str(length),
+        "--min_p",
+        str(min_p),
         "--save_dir",
         str(out_dir),
     ]
-    cmd.extend(["--min_p", str(min_p)])
 
-    print(f"[run] {out_dir.name} -> aria.generate")
-    subprocess.run(cmd, check=True)
+    # Each combo logs to its own file so concurrent runs don't interleave
+    # on (and block writing to) the terminal.
+    tqdm.write(f"[run] {out_dir.name} -> aria.generate")
+    with (out_dir / COMBO_LOG).open("w") as log:
+        return subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+@functools.lru_cache(maxsize=1)
+def load_model(checkpoint: str):
+    # In-process runs are torch_cuda only; the GPU is chosen via CUDA_VISIBLE_DEVICES.
+    from aria.run import _load_inference_model_torch
+
+    return _load_inference_model_torch(
+        checkpoint_path=checkpoint,
+        config_name="medium",
+        strict=False,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_tokenizer():
+    from ariautils.tokenizer import AbsTokenizer
+
+    return AbsTokenizer()
+
+
+@functools.lru_cache(maxsize=None)
+def tokenize_prompt(prompt: str, prompt_duration: int) -> tuple:
+    """Prompt token sequence, parsed once per prompt and reused by every combo."""
+    from aria.run import _get_prompt
+
+    return tuple(_get_prompt(prompt, prompt_duration_s=prompt_duration))
+
+
+def generate_combo(
+    prompt: Path,
+    checkpoint: Path,
+    out_dir: Path,
+    temp: float,
+    top_p: float,
+    min_p: float,
+    prompt_duration: int,
+    length: int,
+    variations: int,
+) -> None:
+    """Same output as `aria.run generate`, reusing the already-loaded model."""
+    from aria.inference.sample_cuda import sample_batch
+
+    # main() already created the prompt bucket; only the leaf is new.
+    out_dir.mkdir(exist_ok=True)
+    model = load_model(str(checkpoint))
+    tokenizer = get_tokenizer()
+    # The cached token tuple is shared by every combo of this prompt; the
+    # sampler takes a list, so pass it a private copy.
+    prompt_seq = list(tokenize_prompt(str(prompt), prompt_duration))
+    max_new_tokens = min(8096 - len(prompt_seq), length)
+
+    results = sample_batch(
+        model=model,
+        tokenizer=tokenizer,
+        prompt=prompt_seq,
+        num_variations=variations,
+        max_new_tokens=max_new_tokens,
+        temp=temp,
+        force_end=False,
+        top_p=top_p,
+        min_p=min_p,
+        compile=False,
+    )
+    for idx, tokenized_seq in enumerate(results):
+        res_midi = tokenizer.detokenize(tokenized_seq).to_midi()
+        res_midi.save(str(out_dir / f"res_{idx + 1}.mid"))
+
+
+def cuda_device_count() -> int:
+    try:
+        import torch
+    except ImportError:
+        return 0
+    return torch.cuda.device_count()
+
+
+def gpu_ids_for(args: argparse.Namespace) -> List[int]:
+    """CUDA devices combos may run on: --gpus, else every visible GPU."""
+    if args.device != "torch_cuda":
+        return []
+    if args.gpus is not None:
+        return args.gpus
+    return list(range(cuda_device_count()))
+
+
+def default_jobs(args: argparse.Namespace) -> int:
+    if args.device == "torch_cuda":
+        return max(1, len(gpu_ids_for(args)))
+    # Honour cgroup/taskset CPU limits where the platform exposes them.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run_in_process(tasks, args, checkpoint: Path) -> List[Path]:
+    failures = []
+    bar = tqdm(total=len(tasks), unit="combo")
+    for prompt, out_dir, temp, top_p, min_p in tasks:
+        bar.write(f"[run] {out_dir.name} -> in-process")
+        try:
+            generate_combo(
+                prompt=prompt,
+                checkpoint=checkpoint,
+                out_dir=out_dir,
+                temp=temp,
+                top_p=top_p,
+                min_p=min_p,
+                prompt_duration=args.prompt_duration,
+                length=args.length,
+                variations=args.variations,
+            )
+        except Exception as e:
+            bar.write(f"[fail] {out_dir}: {e}")
+            failures.append(out_dir)
+        bar.update()
+    bar.close()
+    return failures
+
+
+# Set in a pool worker whose start-up failed; reported by its first task.
+_worker_init_error: Optional[str] = None
+
+
+def _init_worker(checkpoint: Path, gpu_ids) -> None:
+    # Runs once per pool worker: claim a GPU before torch is imported, then
+    # load the model so every combo this worker handles reuses it. Errors are
+    # kept rather than raised: Pool replaces a worker whose initializer raises,
+    # forever, so the sweep would never finish.
+    global _worker_init_error
+    try:
+        if gpu_ids is not None:
+            try:
+                gpu = gpu_ids.get(timeout=GPU_CLAIM_TIMEOUT_S)
+            except queue.Empty:
+                raise RuntimeError("no GPU id left to claim") from None
+            os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu)
+        load_model(str(checkpoint))
+    except Exception as e:
+        _worker_init_error = f"{type(e).__name__}: {e}"
+
+
+def _run_combo_in_worker(task, checkpoint: Path, args: argparse.Namespace):
+    if _worker_init_error is not None:
+        # Propagates out of imap_unordered and stops the whole sweep.
+        raise RuntimeError(f"pool worker failed to start: {_worker_init_error}")
+    prompt, out_dir, temp, top_p, min_p = task
+    try:
+        generate_combo(
+            prompt=prompt,
+            checkpoint=checkpoint,
+            out_dir=out_dir,
+            temp=temp,
+            top_p=top_p,
+            min_p=min_p,
+            prompt_duration=args.prompt_duration,
+            length=args.length,
+            variations=args.variations,
+        )
+    except Exception as e:
+        return out_dir, str(e)
+    return out_dir, None
+
+
+def run_in_pool(tasks, args, checkpoint: Path) -> List[Path]:
+    jobs = min(args.jobs, len(tasks))
+    # Spawned (not forked) workers, so each gets a clean CUDA context.
+    ctx = multiprocessing.get_context("spawn")
+    devices = gpu_ids_for(args)
+    gpu_ids = None
+    if devices:
+        gpu_ids = ctx.Queue()
+        for i in range(jobs):
+            gpu_ids.put(devices[i % len(devices)])
+
+    failures: List[Path] = []
+    worker = functools.partial(_run_combo_in_worker, checkpoint=checkpoint, args=args)
+    with ctx.Pool(
+        processes=jobs,
+        initializer=_init_worker,
+        initargs=(checkpoint, gpu_ids),
+        maxtasksperchild=None,
+    ) as pool, tqdm(total=len(tasks), unit="combo") as bar:
+        try:
+            for out_dir, error in pool.imap_unordered(worker, tasks):
+                if error is not None:
+                    bar.write(f"[fail] {out_dir}: {error}")
+                    failures.append(out_dir)
+                bar.update()
+        except RuntimeError as e:
+            # Per-combo errors come back as results; only start-up failures raise.
+            bar.close()
+            sys.exit(f"[error] {e}")
+    return failures
+
+
+def run_spawned(tasks, args, checkpoint: Path) -> List[Path]:
+    jobs = max(1, args.jobs)
+    devices = gpu_ids_for(args) if jobs > 1 or args.gpus is not None else []
+
+    # One slot per concurrent job; with several GPUs each slot is pinned to a
+    # device so concurrent combos are spread across them.
+    free_slots = deque(devices[i % len(devices)] if devices else None for i in range(jobs))
+    running = deque()  # (out_dir, Popen, slot), oldest first
+    failures: List[Path] = []
+    base_cmd = aria_base_cmd(args, checkpoint)
+    bar = tqdm(total=len(tasks), unit="combo")
+
+    def reap(entry) -> None:
+        out_dir, proc, slot = entry
+        running.remove(entry)
+        if proc.wait() != 0:
+            bar.write(
+                f"[fail] {out_dir}: aria exited with code {proc.returncode} "
+                f"(see {out_dir / COMBO_LOG})"
+            )
+            tail = log_tail(out_dir / COMBO_LOG)
+            if tail:
+                bar.write(tail)
+            failures.append(out_dir)
+        free_slots.append(slot)
+        bar.update()
+
+    def reap_one() -> None:
+        # Prefer any process that already exited, otherwise block on the oldest.
+        done = next((e for e in running if e[1].poll() is not None), running[0])
+        reap(done)
+
+    # Keep up to `jobs` aria processes in flight so one combo's interpreter
+    # start-up and model load overlap with another's sampling.
+    for prompt, out_dir, temp, top_p, min_p in tasks:
+        if not free_slots:
+            reap_one()
+        slot = free_slots.popleft()
+        env = None
+        if slot is not None:
+            env = dict(os.environ, CUDA_VISIBLE_DEVICES=str(slot))
+        try:
+            proc = launch_combo(
+                base_cmd,
+                prompt=prompt,
+                out_dir=out_dir,
+                temp=temp,
+                top_p=top_p,
+                min_p=min_p,
+                env=env,
+            )
+        except OSError as e:
+            bar.write(f"[fail] {out_dir}: {e}")
+            failures.append(out_dir)
+            free_slots.append(slot)
+            bar.update()
+            continue
+        running.append((out_dir, proc, slot))
+
+    while running:
+        reap_one()
+    bar.close()
+    return failures
 
 
 def main() -> None:
     args = parse_args()
 
-    # Collect prompts
+    # Collect prompts (canonical paths, so they can be deduplicated and used as-is)
     prompts: List[Path] = []
     if args.prompt:
         prompts.append(Path(args.prompt).expanduser().resolve())
     if args.prompt_dir:
         prompt_dir = Path(args.prompt_dir).expanduser().resolve()
-        for ext in ("*.mid", "*.midi"):
-            prompts.extend(prompt_dir.glob(ext))
+        with os.scandir(prompt_dir) as it:
+            prompts.extend(
+                Path(entry.path).resolve()
+                for entry in it
+                if entry.is_file() and entry.name.lower().endswith((".mid", ".midi"))
+            )
 
     if not prompts:
         sys.exit("Please provide --prompt or --prompt_dir with MIDI files.")
+    if not args.spawn and args.device != "torch_cuda":
+        sys.exit("In-process generation requires --device torch_cuda; use --spawn otherwise.")
+    if args.jobs is None:
+        args.jobs = default_jobs(args)
 
     # Deduplicate while preserving order
-    seen = set()
-    deduped: List[Path] = []
-    for pth in prompts:
-        if pth not in seen:
-            seen.add(pth)
-            deduped.append(pth)
-    prompts = deduped
+    prompts = list(dict.fromkeys(prompts))
     checkpoint = Path(args.checkpoint).expanduser().resolve()
+    if not checkpoint.is_file():
+        sys.exit(f"Checkpoint not found: {checkpoint}")
 
     combos: Iterable[tuple[float, float, float]] = itertools.product(
         args.temps, args.top_ps, args.min_ps
     )
-    combos = list(combos)
-    print(f"[info] total combinations per prompt: {len(combos)}")
+    # Folder names depend only on the combo, so format them once. Combos that
+    # format to the same folder (repeated or near-equal values) would only
+    # overwrite each other, so keep the first of each.
+    by_name = {}
+    for t, tp, mp in combos:
+        by_name.setdefault(combo_name(t, tp, mp), (t, tp, mp))
+    combo_table = [(t, tp, mp, name) for name, (t, tp, mp) in by_name.items()]
+    print(f"[info] total combinations per prompt: {len(combo_table)}")
     print(f"[info] total prompts: {len(prompts)}")
 
+    out_root_arg = Path(args.out_root).expanduser().resolve() if args.out_root else None
+
+    tasks = []
     for prompt in prompts:
-        prompt = prompt.expanduser().resolve()
-        if args.out_root:
-            out_root = Path(args.out_root).expanduser().resolve()
-        else:
-            out_root = prompt.parent / "grid_outputs"
+        out_root = out_root_arg or prompt.parent / "grid_outputs"
 
         prompt_bucket = out_root / prompt.stem
         ensure_dir(prompt_bucket)
 
-        for temp, top_p, min_p in combos:
-            name = combo_name(temp, top_p, min_p)
+        for temp, top_p, min_p, name in combo_table:
             out_dir = prompt_bucket / name
 
-            if args.skip_existing and out_dir.exists() and any(out_dir.iterdir()):
+            if args.skip_existing and is_nonempty_dir(out_dir):
                 print(f"[skip] {out_dir} (already has contents)")
                 continue
 
-            run_combo(
-                prompt=prompt,
-                checkpoint=checkpoint,
-                out_dir=out_dir,
-                temp=temp,
-                top_p=top_p,
-                min_p=min_p,
-                prompt_duration=args.prompt_duration,
-                length=args.length,
-                variations=args.variations,
-                device=args.device,
-            )
+            tasks.append((prompt, out_dir, temp, top_p, min_p))
+
+    # The prompt x combo grid is one flat work list. When several workers
+    # share it, shuffle so long and short prompts are spread across them
+    # instead of the sweep tailing off on the last prompt's combos.
+    if args.jobs > 1:
+        random.shuffle(tasks)
+
+    if args.spawn:
+        failures = run_spawned(tasks, args, checkpoint)
+    elif args.jobs > 1 and len(tasks) > 1:
+        failures = run_in_pool(tasks, args, checkpoint)
+    else:
+        if args.gpus is not None:
+            # Serial in-process run: pin the first requested GPU before torch loads.
+            os.environ["CUDA_VISIBLE_DEVICES"] = str(args.gpus[0])
+        failures = run_in_process(tasks, args, checkpoint)
+
+    if failures:
+        sys.exit(f"{len(failures)} of {len(tasks)} combos failed.")
 
 
 if __name__ == "__main__":
@@ -13,6 +13,7 @@ Usage (explicit flags, still supported):
 """
 
 import argparse
+import functools
 import logging
 import os
 import platform
@@ -20,7 +21,7 @@ import sys
 import threading
 import queue
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 try:
     from core.datastore import DataStore
@@ -71,9 +72,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _newest_model(models_dir: Path) -> Optional[Path]:
+    """Most recently modified .safetensors/.gen file in models_dir, if any."""
+    if not models_dir.is_dir():
+        return None
+    return max(
+        (f for f in models_dir.iterdir() if f.suffix in (".safetensors", ".gen")),
+        key=lambda f: f.stat().st_mtime,
+        default=None,
+    )
+
+
+@functools.lru_cache(maxsize=8)
 def find_checkpoint(checkpoint_hint: Optional[str] = None) -> str:
     """
     Locate the checkpoint file. 
+
+    Results are cached per hint; call ``find_checkpoint.cache_clear()`` if
+    the models/ folder may have changed in a long-running process.
     
     Args:
         checkpoint_hint: Explicit path provided by user, or None to search defaults.
@@ -87,19 +103,21 @@ def find_checkpoint(checkpoint_hint: Optional[str] = None) -> str:
     # If user provided a path, use it directly
     if checkpoint_hint:
         if os.path.isfile(checkpoint_hint):
-            logger.info(f"Using checkpoint: {checkpoint_hint}")
+            logger.info("Using checkpoint: %s", checkpoint_hint)
             return checkpoint_hint
         
-        # Try relative paths from script location
-        rel_paths = [
-            Path(checkpoint_hint),
-            Path(__file__).parent / checkpoint_hint,
-            Path(__file__).parent.parent / checkpoint_hint,
-        ]
-        for p in rel_paths:
-            if p.exists():
-                logger.info(f"Found checkpoint: {p}")
-                return str(p.resolve())
+        # Try relative paths from script location (joining an absolute hint
+        # onto them yields the same missing path, so skip that case)
+        if not os.path.isabs(checkpoint_hint):
+            rel_paths = [
+                Path(checkpoint_hint),
+                Path(__file__).parent / checkpoint_hint,
+                Path(__file__).parent.parent / checkpoint_hint,
+            ]
+            for p in rel_paths:
+                if p.exists():
+                    logger.info("Found checkpoint: %s", p)
+                    return str(p.resolve())
 
     # If no hint or hint not found, scan models/ directories for any .safetensors/.gen file
     import sys as _sys
@@ -110,17 +128,10 @@ def find_checkpoint(checkpoint_hint: Optional[str] = None) -> str:
     else:
         _bases = [Path(__file__).parent, Path(__file__).parent.parent, Path(".")]
 
-    for base in _bases:
-        models_dir = base / "models"
-        if models_dir.is_dir():
-            candidates = sorted(
-                [f for f in models_dir.iterdir() if f.suffix in (".safetensors", ".gen")],
-                key=lambda f: f.stat().st_mtime,
-                reverse=True,
-            )
-            if candidates:
-                logger.info(f"Found checkpoint: {candidates[0]}")
-                return str(candidates[0].resolve())
+    hit = next(filter(None, (_newest_model(base / "models") for base in _bases)), None)
+    if hit:
+        logger.info("Found checkpoint at default location: %s", hit)
+        return str(hit.resolve())
 
     # Not found
     if checkpoint_hint:
@@ -134,6 +145,59 @@ def find_checkpoint(checkpoint_hint: Optional[str] = None) -> str:
         )
 
 
+def prefetch_checkpoint(checkpoint_path: str) -> threading.Thread:
+    """
+    Read the checkpoint file in a background thread so that the later model
+    load is served from the OS page cache instead of cold disk.
+    """
+    def _read():
+        buf = bytearray(16 * 1024 * 1024)
+        try:
+            with open(checkpoint_path, "rb", buffering=0) as f:
+                while f.readinto(buf):
+                    pass
+        except OSError as e:
+            logger.debug("Checkpoint prefetch failed: %s", e)
+
+    thread = threading.Thread(target=_read, name="checkpoint-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
+def preload_torch() -> threading.Thread:
+    """
+    Import torch in a background thread so its (multi-second) import overlaps
+    with OSC sync and port setup. Later `import torch` statements simply pick
+    up the finished module.
+    """
+    def _import():
+        try:
+            import torch  # noqa: F401
+        except ImportError as e:
+            logger.debug("Background torch import failed: %s", e)
+
+    thread = threading.Thread(target=_import, name="torch-import", daemon=True)
+    thread.start()
+    return thread
+
+
+@functools.lru_cache(maxsize=2)
+def _get_engine(checkpoint_path: str, device: str, config_name: str = "medium"):
+    """
+    Return the AriaEngine for this checkpoint/device, loading it only once per
+    process so every mode and session reuses the same weights.
+    """
+    try:
+        from .core.aria_engine import AriaEngine
+    except ImportError:
+        from core.aria_engine import AriaEngine
+    return AriaEngine(
+        checkpoint_path=checkpoint_path,
+        device=device,
+        config_name=config_name,
+    )
+
+
 def get_midi_ports():
     """
     List available MIDI ports (input and output).
@@ -142,12 +206,12 @@ def get_midi_ports():
         import mido
         logger.info("Available MIDI input ports:")
         for port in mido.get_input_names():
-            logger.info(f"  - {port}")
+            logger.info("  - %s", port)
         logger.info("Available MIDI output ports:")
         for port in mido.get_output_names():
-            logger.info(f"  - {port}")
+            logger.info("  - %s", port)
     except Exception as e:
-        logger.warning(f"Could not list MIDI ports: {e}")
+        logger.warning("Could not list MIDI ports: %s", e)
 
 
 def sync_state_on_startup(osc_controller, timeout: float = 2.0):
@@ -159,88 +223,105 @@ def sync_state_on_startup(osc_controller, timeout: float = 2.0):
     try:
         return osc_controller.sync_state_on_startup(timeout=timeout)
     except Exception as e:
-        logger.warning(f"OSC startup sync failed: {e}")
+        logger.warning("OSC startup sync failed: %s", e)
         return None
 
 
 class FeedbackManager:
+    _FEEDBACK_PARAMS = ("coherence", "repetition", "taste", "continuity")
+
     def __init__(self, datastore: DataStore):
         self.datastore = datastore
-        self.lock = threading.Lock()
-        self.current_episode_id: Optional[str] = None
-        self.draft_pending: bool = False
+        # Only serialises the create/finalize round-trips against the datastore;
+        # grade and slider updates are plain attribute stores.
+        self.lock = threading.RLock()
+        # (current_episode_id, draft_pending), always replaced as a whole.
+        self._state: Tuple[Optional[str], bool] = (None, False)
         self.latest_grade: Optional[int] = None
         self.coherence: Optional[float] = None
         self.repetition: Optional[float] = None
         self.taste: Optional[float] = None
         self.continuity: Optional[float] = None
+        # Finalizing rewrites meta.json and the index; do it off the OSC thread.
+        self._write_q: "queue.Queue[Optional[Tuple[Optional[str], int, Dict]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="feedback-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def current_episode_id(self) -> Optional[str]:
+        return self._state[0]
+
+    @property
+    def draft_pending(self) -> bool:
+        return self._state[1]
 
     def record_generation(self, prompt_bytes: bytes, output_bytes: bytes, params: Dict, mode: str) -> Optional[str]:
         with self.lock:
-            if self.draft_pending:
+            if self._state[1]:
                 logger.warning("Feedback episode already pending commit; skipping new episode.")
                 return None
             enriched = dict(params)
-            enriched.update(
-                {
-                    "coherence": self.coherence,
-                    "repetition": self.repetition,
-                    "taste": self.taste,
-                    "continuity": self.continuity,
-                }
-            )
+            enriched.update({name: getattr(self, name) for name in self._FEEDBACK_PARAMS})
             episode_id = self.datastore.create_episode(prompt_bytes, output_bytes, enriched, mode=mode)
-            self.current_episode_id = episode_id
-            self.draft_pending = True
-            logger.info(f"[feedback] draft_pending -> True ({episode_id})")
+            self._state = (episode_id, True)
+            logger.info("[feedback] draft_pending -> True (%s)", episode_id)
             return episode_id
 
     def set_grade(self, grade: int):
-        with self.lock:
-            self.latest_grade = int(grade)
+        self.latest_grade = int(grade)
 
     def set_feedback_param(self, name: str, value: float):
-        with self.lock:
-            try:
-                v = float(value)
-            except Exception:
-                return
-            if name == "coherence":
-                self.coherence = v
-            elif name == "repetition":
-                self.repetition = v
-            elif name == "taste":
-                self.taste = v
-            elif name == "continuity":
-                self.continuity = v
+        if name not in self._FEEDBACK_PARAMS:
+            return
+        try:
+            v = float(value)
+        except Exception:
+            return
+        setattr(self, name, v)
 
     def commit(self):
         with self.lock:
             grade = self.latest_grade if self.latest_grade is not None else 0
-            feedback = {
-                "coherence": self.coherence,
-                "repetition": self.repetition,
-                "taste": self.taste,
-                "continuity": self.continuity,
-            }
+            feedback = {name: getattr(self, name) for name in self._FEEDBACK_PARAMS}
 
-            episode_id = self.current_episode_id if (self.draft_pending and self.current_episode_id) else None
+            current_id, pending = self._state
+            episode_id = current_id if (pending and current_id) else None
+            self._state = (None, False)
+            self.latest_grade = None
+        self._write_q.put((episode_id, grade, feedback))
 
-            if episode_id is None:
-                logger.warning("Commit requested without draft_pending; checking for recent uncommitted episode.")
-                episode_id = self.datastore.find_most_recent_draft_episode()
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush queued commits and stop the writer thread."""
+        self._write_q.put(None)
+        self._writer.join(timeout=timeout)
+        with self.lock:
+            self.datastore.flush()
 
-                if episode_id is None:
-                    logger.warning("No pending feedback episode to commit.")
-                    return
+    def _writer_loop(self):
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                return
+            episode_id, grade, feedback = item
+            try:
+                with self.lock:
+                    self._finalize(episode_id, grade, feedback)
+            except Exception as e:
+                logger.exception("Failed to finalize feedback episode %s: %s", episode_id, e)
 
-                logger.warning(f"Recovered recent uncommitted feedback episode: {episode_id}")
+    def _finalize(self, episode_id: Optional[str], grade: int, feedback: Dict):
+        if episode_id is None:
+            logger.warning("Commit requested without draft_pending; checking for recent uncommitted episode.")
+            episode_id = self.datastore.find_most_recent_draft_episode()
 
-            self.datastore.finalize_episode(episode_id, grade, feedback=feedback)
-            logger.info(f"Feedback episode {episode_id} finalized with grade={grade}.")
-            self.current_episode_id = None
-            self.draft_pending = False
-            self.latest_grade = None
+            if episode_id is None:
+                logger.warning("No pending feedback episode to commit.")
+                return
+
+            logger.warning("Recovered recent uncommitted feedback episode: %s", episode_id)
+
+        self.datastore.finalize_episode(episode_id, grade, feedback=feedback)
+        logger.info("Feedback episode %s finalized with grade=%s.", episode_id, grade)
 
 
 def _make_tray_icon():
@@ -488,6 +569,9 @@ def main():
         get_midi_ports()
         return 0
 
+    # Every backend goes through AriaEngine, which needs torch.
+    torch_import = preload_torch()
+
     if args.feedback:
         if args.data_dir is not None:
             data_dir = Path(args.data_dir)
@@ -510,10 +594,10 @@ def main():
         # Handle both module and script execution (with new directory structure)
         try:
             from .core.midi_buffer import RollingMidiBuffer
-            from .core.aria_engine import AriaEngine
             from .core.bridge_engine import AbletonBridge
             from .core.tempo_tracker import TempoTracker
             from .core.sampling_state import SamplingState, SessionState
+            from .core.signal_queue import SignalQueue
             from .modes.manual_mode import ManualModeSession
             from .modes.sampling_hotkeys import start_sampling_hotkeys
             from .modes.osc_controller import OscController
@@ -521,17 +605,22 @@ def main():
             import_mode = "package"
         except ImportError:
             from core.midi_buffer import RollingMidiBuffer
-            from core.aria_engine import AriaEngine
             from core.bridge_engine import AbletonBridge
             from core.tempo_tracker import TempoTracker
             from core.sampling_state import SamplingState, SessionState
+            from core.signal_queue import SignalQueue
             from modes.manual_mode import ManualModeSession
             from modes.sampling_hotkeys import start_sampling_hotkeys
             from modes.osc_controller import OscController
             from ui.ui_panel import run_ui
             import_mode = "script"
 
-        logger.debug(f"Import mode: {import_mode}")
+        logger.debug("Import mode: %s", import_mode)
+
+        # Resolve the checkpoint up front and warm the page cache with it while
+        # OSC sync, device checks and hotkeys are being set up.
+        checkpoint_path = find_checkpoint(args.checkpoint)
+        checkpoint_prefetch = prefetch_checkpoint(checkpoint_path)
 
         # Shared state + queues (init before heavy model load so OSC can sync immediately)
         sampling_state = SamplingState(
@@ -540,8 +629,9 @@ def main():
             min_p=args.min_p if args.min_p is not None else 0.0,
         )
         session_state = SessionState(mode=args.mode)
-        cmd_queue = queue.Queue()
-        log_queue = queue.Queue()
+        # Commands must never be dropped; log lines may be if the UI falls behind.
+        cmd_queue = SignalQueue()
+        log_queue = SignalQueue(maxlen=256)
         hotkey_stop = threading.Event()
 
         osc = None
@@ -562,23 +652,25 @@ def main():
             osc.start()
             startup_state = sync_state_on_startup(osc, timeout=2.0)
             if startup_state:
-                logger.info(f"OSC params after startup sync: {startup_state}")
+                logger.info("OSC params after startup sync: %s", startup_state)
                 t = startup_state.get('temp', 0)
                 tp = startup_state.get('top_p', 0)
                 tok = startup_state.get('tokens', 0)
                 print(f"STATUS:synced:temp={t:.2f} top_p={tp:.2f} tokens={tok}", flush=True)
 
         # Resolve device (auto-detect if not specified)
+        if args.device in (None, "cuda"):
+            torch_import.join()
         if args.device is None:
             args.device = _auto_detect_device()
-            logger.info(f"Auto-detected device: {args.device}")
+            logger.info("Auto-detected device: %s", args.device)
 
         if args.device == "cuda":
             import torch
             if not torch.cuda.is_available():
                 logger.error("CUDA requested but not available. Use --device mlx (Apple Silicon) or --device cpu")
                 return 1
-            logger.info(f"CUDA device: {torch.cuda.get_device_name(0)}")
+            logger.info("CUDA device: %s", torch.cuda.get_device_name(0))
         elif args.device == "mlx":
             try:
                 import mlx.core  # noqa: F401
@@ -589,34 +681,29 @@ def main():
         else:
             logger.info("CPU device (inference will be slow)")
 
-        checkpoint_path = find_checkpoint(args.checkpoint)
-
         # Keyboard hotkeys (after OSC sync so defaults reflect Max state)
         start_sampling_hotkeys(sampling_state, hotkey_stop)
 
-        logger.info(f"Connecting to ports: IN={args.in_port}, OUT={args.out_port}")
-        logger.info(f"Checkpoint: {checkpoint_path}")
+        logger.info("Connecting to ports: IN=%s, OUT=%s", args.in_port, args.out_port)
+        logger.info("Checkpoint: %s", checkpoint_path)
         logger.info(
-            f"Listen {args.listen_seconds}s -> Generate {args.gen_seconds}s -> "
-            f"Cooldown {args.cooldown_seconds}s"
+            "Listen %ss -> Generate %ss -> Cooldown %ss",
+            args.listen_seconds, args.gen_seconds, args.cooldown_seconds,
         )
         if args.mode == "manual":
             logger.info("Manual mode selected: keyboard-driven recording without MIDI clock.")
         else:
             if args.clock_in:
-                logger.info(f"MIDI Clock input: {args.clock_in}")
+                logger.info("MIDI Clock input: %s", args.clock_in)
 
         # Create shared engine
-        engine = AriaEngine(
-            checkpoint_path=checkpoint_path,
-            device=args.device,
-            config_name="medium",
-        )
+        checkpoint_prefetch.join()
+        engine = _get_engine(checkpoint_path, args.device, "medium")
         print("STATUS:ready", flush=True)
 
         if osc:
             osc.send_status(session_state.status if hasattr(session_state, "status") else "IDLE")
-            osc.send_params()
+            osc.send_params(force=True)
 
         if args.mode == "manual":
             session = ManualModeSession(
@@ -670,7 +757,7 @@ def main():
         # TempoTracker conflicts with ClockGrid on the same MIDI port; skip when clock_in is set.
         tempo_tracker = None
         if args.clock_in:
-            logger.info(f"Using ClockGrid on '{args.clock_in}'; disabling TempoTracker (port conflict)")
+            logger.info("Using ClockGrid on '%s'; disabling TempoTracker (port conflict)", args.clock_in)
         
         bridge = AbletonBridge(
             in_port_name=args.in_port,
@@ -708,9 +795,13 @@ def main():
         print(f"STATUS:error:{e}", flush=True)
         return 1
     except Exception as e:
-        logger.exception(f"Fatal error: {e}")
+        logger.exception("Fatal error: %s", e)
         print(f"STATUS:error:{e}", flush=True)
         return 1
+    finally:
+        if feedback_manager is not None:
+            feedback_manager.close()
+        _get_engine.cache_clear()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,93 @@
+import atexit
 import csv
 import hashlib
 import json
 import os
 import tempfile
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
+_HASH_CHUNK = 1 << 20
+# Below this size hashing both files inline beats handing them to threads.
+_PARALLEL_HASH_MIN = 64 * 1024
+# Fresh sha256 contexts are cloned from this one rather than re-initialised.
+_SHA256 = hashlib.sha256()
+
+# Stores with possibly unwritten index rows; held weakly so registering for
+# the exit flush never keeps a DataStore alive.
+_open_stores: "weakref.WeakSet[DataStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        store.flush()
+
+
+def _write_and_hash(path: Path, data: bytes) -> str:
+    """Write `data` to `path` and return its SHA-256, in one pass over the bytes."""
+    h = _SHA256.copy()
+    view = memoryview(data)
+    with path.open("wb") as f:
+        for start in range(0, len(view), _HASH_CHUNK):
+            chunk = view[start:start + _HASH_CHUNK]
+            h.update(chunk)
+            f.write(chunk)
+    return h.hexdigest()
+
+
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+
+def _csv_escape(value) -> str:
+    s = "" if value is None else str(value)
+    if _CSV_SPECIAL.isdisjoint(s):
+        return s
+    return '"' + s.replace('"', '""') + '"'
+
+
+def _csv_line(values) -> str:
+    """One index row in the same format csv.writer produces."""
+    return ",".join(map(_csv_escape, values)) + "\r\n"
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Replace `path` with `payload` via a fsynced temp file in the same folder."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_name, path)
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(path: Path) -> None:
+    """Persist a rename in `path`; directories can't be opened this way on Windows."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    dfd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
 
 class DataStore:
+    # Appended index rows are buffered and written out together. The limits
+    # are only checked when a row is appended: the batch goes out once this
+    # many are pending, or on the first append this long after the last
+    # write. Anything still buffered is written by flush(), which
+    # FeedbackManager.close() and interpreter exit both call.
+    FLUSH_ROWS = 16
+    FLUSH_AFTER_S = 2.0
+
     INDEX_HEADER = [
         "episode_id",
         "timestamp_local",
@@ -33,9 +111,20 @@ class DataStore:
         self.index_path = self.base_dir / "index.csv"
         self.episodes_dir = self.base_dir / "episodes"
         self.episodes_dir.mkdir(parents=True, exist_ok=True)
+        self._meta_paths: Dict[str, Path] = {}
+        self._pending_rows: List[bytes] = []
+        self._last_flush = time.monotonic()
         self._ensure_index()
+        _open_stores.add(self)
 
     def _ensure_index(self):
+        # Rows (without the header) are kept in memory so updates and lookups
+        # never have to re-read index.csv.
+        self._index_rows: List[List[str]] = []
+        # Each row's encoded CSV line, so a rewrite is a single join.
+        self._index_row_bytes: List[bytes] = []
+        self._index_by_id: Dict[str, int] = {}
+
         if not self.index_path.exists():
             self.index_path.write_text(",".join(self.INDEX_HEADER) + os.linesep, encoding="utf-8")
             return
@@ -49,19 +138,45 @@ class DataStore:
 
         header = rows[0]
         if header == self.INDEX_HEADER:
+            for row in rows[1:]:
+                if row:
+                    self._remember_row(row)
             return
 
-        normalized_rows = [self.INDEX_HEADER]
         for row in rows[1:]:
             if not any(row):
                 continue
-            normalized_rows.append(self._normalize_index_row(row, header))
+            self._remember_row(self._normalize_index_row(row, header))
+        self._write_index()
+
+    def _remember_row(self, row: List[str], line: Optional[bytes] = None):
+        self._index_by_id[row[0]] = len(self._index_rows)
+        self._index_rows.append(row)
+        self._index_row_bytes.append(line if line is not None else _csv_line(row).encode("utf-8"))
+
+    def _write_index(self):
+        header = _csv_line(self.INDEX_HEADER).encode("utf-8")
+        _atomic_write_bytes(self.index_path, header + b"".join(self._index_row_bytes))
+        # The rewrite already contains every buffered row.
+        self._pending_rows.clear()
+        self._last_flush = time.monotonic()
+
+    def _maybe_flush(self, force: bool = False):
+        if not self._pending_rows:
+            return
+        if not force and (
+            len(self._pending_rows) < self.FLUSH_ROWS
+            and time.monotonic() - self._last_flush < self.FLUSH_AFTER_S
+        ):
+            return
+        with self.index_path.open("ab") as f:
+            f.write(b"".join(self._pending_rows))
+        self._pending_rows.clear()
+        self._last_flush = time.monotonic()
 
-        with tempfile.NamedTemporaryFile("w", delete=False, dir=self.index_path.parent, newline="", encoding="utf-8") as tmp:
-            writer = csv.writer(tmp)
-            writer.writerows(normalized_rows)
-            tmp_path = Path(tmp.name)
-        tmp_path.replace(self.index_path)
+    def flush(self):
+        """Write any buffered index rows to index.csv."""
+        self._maybe_flush(force=True)
 
     def _normalize_index_row(self, row, header):
         normalized = {key: "" for key in self.INDEX_HEADER}
@@ -93,33 +208,15 @@ class DataStore:
 
     def _atomic_write_json(self, path: Path, data: dict):
         path.parent.mkdir(parents=True, exist_ok=True)
-        with tempfile.NamedTemporaryFile("w", delete=False, dir=path.parent, encoding="utf-8") as tmp:
-            json.dump(data, tmp, indent=2)
-            tmp_path = Path(tmp.name)
-        tmp_path.replace(path)
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        _atomic_write_bytes(path, payload)
 
     def _append_index_row(self, row: Dict[str, str]):
-        self._ensure_index()
-        with self.index_path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    row.get("episode_id", ""),
-                    row.get("timestamp_local", ""),
-                    row.get("status", ""),
-                    row.get("grade", ""),
-                    row.get("coherence", ""),
-                    row.get("repetition", ""),
-                    row.get("taste", ""),
-                    row.get("continuity", ""),
-                    row.get("temperature", ""),
-                    row.get("top_p", ""),
-                    row.get("min_p", ""),
-                    row.get("max_tokens", ""),
-                    row.get("seed", ""),
-                    row.get("mode", ""),
-                ]
-            )
+        values = ["" if row.get(key) is None else str(row[key]) for key in self.INDEX_HEADER]
+        line = _csv_line(values).encode("utf-8")
+        self._pending_rows.append(line)
+        self._remember_row(values, line)
+        self._maybe_flush()
 
     def _update_index_row(
         self,
@@ -128,29 +225,19 @@ class DataStore:
         grade: Optional[int],
         feedback: Optional[Dict[str, Optional[float]]] = None,
     ):
-        if not self.index_path.exists():
+        idx = self._index_by_id.get(episode_id)
+        if idx is None:
             return
-        rows = []
-        with self.index_path.open("r", newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if row and row[0] == "episode_id":
-                    rows.append(row)
-                    continue
-                if row and row[0] == episode_id:
-                    row[2] = status
-                    row[3] = "" if grade is None else str(int(grade))
-                    if feedback:
-                        row[4] = "" if feedback.get("coherence") is None else str(feedback["coherence"])
-                        row[5] = "" if feedback.get("repetition") is None else str(feedback["repetition"])
-                        row[6] = "" if feedback.get("taste") is None else str(feedback["taste"])
-                        row[7] = "" if feedback.get("continuity") is None else str(feedback["continuity"])
-                rows.append(row)
-        with tempfile.NamedTemporaryFile("w", delete=False, dir=self.index_path.parent, newline="", encoding="utf-8") as tmp:
-            writer = csv.writer(tmp)
-            writer.writerows(rows)
-            tmp_path = Path(tmp.name)
-        tmp_path.replace(self.index_path)
+        row = self._index_rows[idx]
+        row[2] = status
+        row[3] = "" if grade is None else str(int(grade))
+        if feedback:
+            row[4] = "" if feedback.get("coherence") is None else str(feedback["coherence"])
+            row[5] = "" if feedback.get("repetition") is None else str(feedback["repetition"])
+            row[6] = "" if feedback.get("taste") is None else str(feedback["taste"])
+            row[7] = "" if feedback.get("continuity") is None else str(feedback["continuity"])
+        self._index_row_bytes[idx] = _csv_line(row).encode("utf-8")
+        self._write_index()
 
     def create_episode(
         self,
@@ -170,11 +257,17 @@ class DataStore:
 
         prompt_path = episode_dir / "prompt.mid"
         output_path = episode_dir / "output.mid"
-        prompt_path.write_bytes(prompt_bytes)
-        output_path.write_bytes(output_bytes)
-
-        prompt_hash = hashlib.sha256(prompt_bytes).hexdigest()
-        output_hash = hashlib.sha256(output_bytes).hexdigest()
+        if max(len(prompt_bytes), len(output_bytes)) >= _PARALLEL_HASH_MIN:
+            # hashlib releases the GIL on large buffers, so the two files
+            # really are written and hashed side by side.
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                prompt_future = ex.submit(_write_and_hash, prompt_path, prompt_bytes)
+                output_future = ex.submit(_write_and_hash, output_path, output_bytes)
+                prompt_hash = prompt_future.result()
+                output_hash = output_future.result()
+        else:
+            prompt_hash = _write_and_hash(prompt_path, prompt_bytes)
+            output_hash = _write_and_hash(output_path, output_bytes)
 
         meta = {
             "episode_id": episode_id,
@@ -196,7 +289,9 @@ class DataStore:
                 "output_mid_sha256": output_hash,
             },
         }
-        self._atomic_write_json(episode_dir / "meta.json", meta)
+        meta_path = episode_dir / "meta.json"
+        self._atomic_write_json(meta_path, meta)
+        self._meta_paths[episode_id] = meta_path
 
         self._append_index_row(
             {
@@ -219,26 +314,51 @@ class DataStore:
 
         return episode_id
 
+    def _find_meta_path(self, episode_id: str) -> Optional[Path]:
+        cached = self._meta_paths.get(episode_id)
+        if cached is not None and cached.exists():
+            return cached
+
+        # Episode ids start with YYYYmmdd, which names the date folder.
+        date_str = f"{episode_id[:4]}-{episode_id[4:6]}-{episode_id[6:8]}"
+        meta_path = self.episodes_dir / date_str / episode_id / "meta.json"
+        if meta_path.exists():
+            return meta_path
+
+        # Legacy/moved episodes: look for the episode folder under any other
+        # date folder. DirEntry.is_dir() uses the cached d_type, so this
+        # costs one scandir per date folder and no per-file stat or parse.
+        try:
+            with os.scandir(self.episodes_dir) as dates:
+                date_dirs = [d.path for d in dates if d.is_dir(follow_symlinks=False) and d.name != date_str]
+        except OSError:
+            return None
+        for date_dir in date_dirs:
+            try:
+                with os.scandir(date_dir) as episodes:
+                    for entry in episodes:
+                        if entry.name == episode_id and entry.is_dir():
+                            candidate = Path(entry.path) / "meta.json"
+                            if candidate.exists():
+                                return candidate
+            except OSError:
+                continue
+        return None
+
     def finalize_episode(
         self,
         episode_id: str,
         grade: int,
         feedback: Optional[Dict[str, Optional[float]]] = None,
     ):
-        # Find meta.json
-        meta_path = None
-        for candidate in self.episodes_dir.rglob("meta.json"):
-            try:
-                with candidate.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if data.get("episode_id") == episode_id:
-                    meta_path = candidate
-                    meta = data
-                    break
-            except Exception:
-                continue
+        meta_path = self._find_meta_path(episode_id)
         if not meta_path:
             return
+        try:
+            with meta_path.open("r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception:
+            return
 
         meta["status"] = "final"
         meta["grade"] = int(grade)
@@ -251,14 +371,8 @@ class DataStore:
         self._update_index_row(episode_id, "final", int(grade), feedback=feedback)
 
     def find_most_recent_draft_episode(self) -> Optional[str]:
-        if not self.index_path.exists():
-            return None
-
-        with self.index_path.open("r", newline="", encoding="utf-8") as f:
-            rows = list(csv.reader(f))
-
-        for row in reversed(rows[1:]):
-            if row and len(row) >= 3 and row[2] == "draft":
+        for row in reversed(self._index_rows):
+            if len(row) >= 3 and row[2] == "draft":
                 return row[0]
 
         return None
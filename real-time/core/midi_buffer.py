@@ -2,14 +2,16 @@
 
 import threading
 import time
+from array import array
+from bisect import bisect_right
 from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TimestampedMidiMsg:
-    """A MIDI message with its reception timestamp."""
+    """A MIDI message with its reception timestamp (slotted: one per captured event)."""
     msg_type: str  # 'note_on', 'note_off', 'control_change'
     note: Optional[int] = None  # 0-127
     velocity: Optional[int] = None  # 0-127, or None for note_off
@@ -19,6 +21,75 @@ class TimestampedMidiMsg:
     pulse: Optional[int] = None  # MIDI clock pulse index (24ppqn)
 
 
+# Small-int codes for the message kinds CaptureBuffer stores.
+NOTE_ON, NOTE_OFF, CONTROL_CHANGE = 0, 1, 2
+_KIND_NAMES = ("note_on", "note_off", "control_change")
+KIND_CODES = {name: code for code, name in enumerate(_KIND_NAMES)}
+
+
+class CaptureBuffer:
+    """
+    Append-only struct-of-arrays store for one recorded take.
+
+    Each event is a microsecond offset from the take start plus a kind code
+    and two data bytes (note/velocity or control/value), kept in parallel
+    `array`s instead of one object per event. Arrays are pre-sized and filled
+    by index; a single writer thread appends, readers look only at `[:n]`.
+    """
+
+    __slots__ = ("ts_us", "kind", "data1", "data2", "n")
+
+    def __init__(self, capacity: int = 0):
+        self.ts_us = array("q", bytes(8 * capacity))
+        self.kind = array("B", bytes(capacity))
+        self.data1 = array("B", bytes(capacity))
+        self.data2 = array("B", bytes(capacity))
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def append(self, ts_us: int, kind: int, data1: int, data2: int) -> None:
+        n = self.n
+        if n >= len(self.kind):
+            self._grow(max(n, 256))
+        self.ts_us[n] = ts_us
+        self.kind[n] = kind
+        self.data1[n] = data1
+        self.data2[n] = data2
+        self.n = n + 1
+
+    def _grow(self, extra: int) -> None:
+        self.ts_us.frombytes(bytes(8 * extra))
+        for arr in (self.kind, self.data1, self.data2):
+            arr.frombytes(bytes(extra))
+
+    def truncate(self, n: int) -> None:
+        """Keep only the first `n` events."""
+        self.n = min(self.n, max(0, n))
+
+    def truncate_after(self, ts_us: int) -> None:
+        """Drop events later than `ts_us`; offsets are appended in order, so this is a bisect."""
+        self.n = bisect_right(self.ts_us, ts_us, 0, self.n)
+
+    def onset_times(self) -> Iterator[float]:
+        """Seconds from the take start of every note_on with velocity > 0."""
+        ts, kind, vel = self.ts_us, self.kind, self.data2
+        return (ts[i] * 1e-6 for i in range(self.n) if kind[i] == NOTE_ON and vel[i])
+
+    def to_messages(self) -> List[TimestampedMidiMsg]:
+        """Expand to TimestampedMidiMsg records (timestamps in seconds from the take start)."""
+        out = []
+        for i in range(self.n):
+            k = self.kind[i]
+            t = self.ts_us[i] * 1e-6
+            if k == CONTROL_CHANGE:
+                out.append(TimestampedMidiMsg("control_change", control=self.data1[i], value=self.data2[i], timestamp=t))
+            else:
+                out.append(TimestampedMidiMsg(_KIND_NAMES[k], self.data1[i], self.data2[i], timestamp=t))
+        return out
+
+
 class RollingMidiBuffer:
     """
     Thread-safe rolling buffer maintaining MIDI messages from the last N seconds.
@@ -2,7 +2,7 @@
 
 import tempfile
 import time
-from typing import List
+from typing import List, Optional, Tuple
 
 try:
     from .midi_buffer import TimestampedMidiMsg
@@ -134,6 +134,7 @@ def buffer_to_tempfile_midi(
     window_seconds: float = 4.0,
     current_bpm: float = None,
     ticks_per_beat: int = 480,
+    now: Optional[float] = None,
 ) -> str:
     """
     Convert buffer to a temporary MIDI file and return path.
@@ -146,10 +147,53 @@ def buffer_to_tempfile_midi(
         window_seconds: Time window to extract (default: 4.0s)
         current_bpm: Current BPM from tempo tracker (optional)
         ticks_per_beat: MIDI resolution (default: 480)
+        now: End of the window on the same clock as the message timestamps
+            (default: time.monotonic())
     
     Returns:
         Path to the temporary .mid file.
     """
+    mid = _buffer_to_midifile(messages, window_seconds, current_bpm, ticks_per_beat, now)
+    return _save_tempfile(mid)
+
+
+def buffer_to_tempfile_midi_with_stats(
+    messages: List[TimestampedMidiMsg],
+    window_seconds: float = 4.0,
+    current_bpm: float = None,
+    ticks_per_beat: int = 480,
+    now: Optional[float] = None,
+    path: Optional[str] = None,
+) -> Tuple[str, int, float]:
+    """
+    Same as buffer_to_tempfile_midi, but also return (total_ticks, length_s)
+    of the written file, taken from the in-memory MidiFile rather than by
+    re-reading it. If `path` is given the file is (over)written there instead
+    of in a new temporary file.
+    """
+    mid = _buffer_to_midifile(messages, window_seconds, current_bpm, ticks_per_beat, now)
+    if path:
+        mid.save(path)
+    else:
+        path = _save_tempfile(mid)
+    total_ticks = max((sum(msg.time for msg in track) for track in mid.tracks), default=0)
+    return path, total_ticks, mid.length
+
+
+def _save_tempfile(mid: MidiFile) -> str:
+    tmp = tempfile.NamedTemporaryFile(suffix='.mid', delete=False)
+    tmp.close()
+    mid.save(tmp.name)
+    return tmp.name
+
+
+def _buffer_to_midifile(
+    messages: List[TimestampedMidiMsg],
+    window_seconds: float,
+    current_bpm: float,
+    ticks_per_beat: int,
+    now: Optional[float] = None,
+) -> MidiFile:
     # Handle empty input
     if not messages:
         mid = MidiFile()
@@ -166,7 +210,8 @@ def buffer_to_tempfile_midi(
         if has_pulse:
             windowed_msgs = list(messages)
         else:
-            now = time.monotonic()
+            if now is None:
+                now = time.monotonic()
             cutoff_time = now - window_seconds
             windowed_msgs = [msg for msg in messages if msg.timestamp >= cutoff_time]
 
@@ -240,8 +285,4 @@ def buffer_to_tempfile_midi(
                         track.append(Message('control_change', control=64, value=value, time=delta))
                         last_tick = tick
 
-    # Write to temp file
-    tmp = tempfile.NamedTemporaryFile(suffix='.mid', delete=False)
-    tmp.close()
-    mid.save(tmp.name)
-    return tmp.name
+    return mid
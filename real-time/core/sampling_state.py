@@ -4,67 +4,85 @@ import threading
 
 
 class SamplingState: # tracks the temp, minp top p values. 
-    """Holds temperature, top_p, min_p with thread-safe getters/setters."""
+    """
+    Holds temperature, top_p, min_p as one immutable tuple. Writers swap in a
+    new tuple under the lock; readers take the current reference without it.
+    """
+
+    _TEMP, _TOP_P, _MIN_P = 0, 1, 2
 
     def __init__(self, temperature: float, top_p: float, min_p: float | None):
         self._lock = threading.Lock()
-        self.temperature = round(temperature, 2)
-        self.top_p = round(top_p, 2)
-        self.min_p = round(0.0 if min_p is None else min_p, 2)
+        self._values = (
+            round(temperature, 2),
+            round(top_p, 2),
+            round(0.0 if min_p is None else min_p, 2),
+        )
 
     # --- helpers ---
     def _clamp(self, val, lo, hi):
         return max(lo, min(hi, val))
 
+    def _store(self, idx: int, val: float, lo: float, hi: float) -> float:
+        # Called with the lock held.
+        new = round(self._clamp(val, lo, hi), 2)
+        values = list(self._values)
+        values[idx] = new
+        self._values = tuple(values)
+        return new
+
+    @property
+    def temperature(self) -> float:
+        return self._values[self._TEMP]
+
+    @property
+    def top_p(self) -> float:
+        return self._values[self._TOP_P]
+
+    @property
+    def min_p(self) -> float:
+        return self._values[self._MIN_P]
+
     def increase_temperature(self):
         with self._lock:
-            self.temperature = round(self._clamp(self.temperature + 0.05, 0.1, 2.0), 2)
-            return self.temperature
+            return self._store(self._TEMP, self._values[self._TEMP] + 0.05, 0.1, 2.0)
 
     def decrease_temperature(self):
         with self._lock:
-            self.temperature = round(self._clamp(self.temperature - 0.05, 0.1, 2.0), 2)
-            return self.temperature
+            return self._store(self._TEMP, self._values[self._TEMP] - 0.05, 0.1, 2.0)
 
     def increase_top_p(self):
         with self._lock:
-            self.top_p = round(self._clamp(self.top_p + 0.01, 0.1, 1.0), 2)
-            return self.top_p
+            return self._store(self._TOP_P, self._values[self._TOP_P] + 0.01, 0.1, 1.0)
 
     def decrease_top_p(self):
         with self._lock:
-            self.top_p = round(self._clamp(self.top_p - 0.01, 0.1, 1.0), 2)
-            return self.top_p
+            return self._store(self._TOP_P, self._values[self._TOP_P] - 0.01, 0.1, 1.0)
 
     def increase_min_p(self):
         with self._lock:
-            self.min_p = round(self._clamp(self.min_p + 0.01, 0.0, 0.2), 2)
-            return self.min_p
+            return self._store(self._MIN_P, self._values[self._MIN_P] + 0.01, 0.0, 0.2)
 
     def decrease_min_p(self):
         with self._lock:
-            self.min_p = round(self._clamp(self.min_p - 0.01, 0.0, 0.2), 2)
-            return self.min_p
+            return self._store(self._MIN_P, self._values[self._MIN_P] - 0.01, 0.0, 0.2)
 
     def get_values(self):
-        with self._lock:
-            return self.temperature, self.top_p, self.min_p
+        # Reference read of an immutable tuple: always a consistent triple.
+        return self._values
 
     # direct setters (used by OSC)
     def set_temperature(self, v: float):
         with self._lock:
-            self.temperature = round(self._clamp(v, 0.1, 2.0), 2)
-            return self.temperature
+            return self._store(self._TEMP, v, 0.1, 2.0)
 
     def set_top_p(self, v: float):
         with self._lock:
-            self.top_p = round(self._clamp(v, 0.1, 1.0), 2)
-            return self.top_p
+            return self._store(self._TOP_P, v, 0.1, 1.0)
 
     def set_min_p(self, v: float):
         with self._lock:
-            self.min_p = round(self._clamp(v, 0.0, 0.2), 2)
-            return self.min_p
+            return self._store(self._MIN_P, v, 0.0, 0.2)
 
 
 class SessionState: # tracks what is happening in the current session like recording status, last output etc. 
@@ -105,6 +123,21 @@ class SessionState: # tracks what is happening in the current session like recor
         with self._lock:
             self.last_record_level = level
 
+    def try_transition_record(self, flag: int) -> str:
+        """
+        Apply a /aria/record level under one lock. Returns "unchanged",
+        "already_recording", "set_only" (stop while idle), "start" or "stop".
+        """
+        with self._lock:
+            if self.last_record_level == flag:
+                return "unchanged"
+            if flag == 1 and self.is_recording:
+                return "already_recording"
+            self.last_record_level = flag
+            if flag == 0 and not self.is_recording:
+                return "set_only"
+            return "start" if flag == 1 else "stop"
+
     def set_recording(self, flag: bool):
         with self._lock:
             self.is_recording = flag
@@ -0,0 +1,68 @@
+"""Lightweight deque + Event channel for UI/OSC commands and log lines."""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+
+class SignalQueue:
+    """
+    Drop-in for the parts of queue.Queue the bridge uses (put/get/get_nowait/
+    task_done/empty), backed by a deque and a single wake-up Event.
+
+    deque.append/popleft are atomic, so the items themselves need no lock;
+    the only lock a producer takes is the Event's, inside set(). With
+    `maxlen` set the oldest entries are discarded when the consumer lags,
+    which suits status/log traffic but not commands.
+    """
+
+    def __init__(self, maxlen: Optional[int] = None):
+        self._items: deque = deque(maxlen=maxlen)
+        self._ready = threading.Event()
+        self._listeners: tuple = ()
+
+    def add_listener(self, event: threading.Event) -> None:
+        """Also set `event` on every put, so a consumer can wait on one Event for several sources."""
+        self._listeners = self._listeners + (event,)
+
+    def put(self, item: Any) -> None:
+        self._items.append(item)
+        self._ready.set()
+        for event in self._listeners:
+            event.set()
+
+    def put_nowait(self, item: Any) -> None:
+        self.put(item)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            if not block:
+                raise queue.Empty
+            # Clear, then re-check, so a put() racing with us is never missed.
+            self._ready.clear()
+            if self._items:
+                continue
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self._ready.wait(remaining)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def task_done(self) -> None:
+        # Kept for queue.Queue compatibility; nothing joins on this channel.
+        pass
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
@@ -28,8 +28,7 @@ class ClockGrid:
         self.measures = measures
         self.beats_per_bar = beats_per_bar
 
-        self.pulses_per_bar = self.beats_per_bar * PPQN
-        self.pulses_per_block = max(1, int(self.measures) * self.pulses_per_bar)
+        self.pulses_per_bar, self.pulses_per_block = self.compute_pulses(PPQN, beats_per_bar, measures)
 
         self.lock = threading.RLock()
         self.clock_port = None
@@ -42,6 +41,12 @@ class ClockGrid:
         self.boundary_callbacks: List[Callable[[int], None]] = []
         self.last_pulse_log_time = time.monotonic()
 
+    @staticmethod
+    def compute_pulses(ppqn: int, beats_per_bar: int, measures: int) -> tuple[int, int]:
+        """Return (pulses_per_bar, pulses_per_block) for the given meter and block length."""
+        pulses_per_bar = beats_per_bar * ppqn
+        return pulses_per_bar, max(1, int(measures) * pulses_per_bar)
+
     def register_boundary_callback(self, cb: Callable[[int], None]):
         with self.lock:
             self.boundary_callbacks.append(cb)
@@ -8,20 +8,48 @@ into a prompt for Aria with timing preserved from the captured deltas.
 from __future__ import annotations
 
 import ctypes
+import itertools
 import logging
 import os
 import statistics
+import sys
+import tempfile
 import threading
 import time
 import queue
-from typing import Iterable, List, Optional, Tuple
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ClassVar, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 
-from core.midi_buffer import TimestampedMidiMsg
-from core.prompt_midi import buffer_to_tempfile_midi
+import mido
+
+from core.midi_buffer import CONTROL_CHANGE, KIND_CODES, CaptureBuffer, TimestampedMidiMsg
+from core.prompt_midi import buffer_to_tempfile_midi_with_stats
+from core.signal_queue import SignalQueue
 
 logger = logging.getLogger(__name__)
 
+# MIDI message types captured from the input and forwarded on playback.
+_KEEP_TYPES = frozenset({"note_on", "note_off", "control_change"})
+
+
+# (epoch second, "HH:MM:SS") of the last UI log line; swapped as one tuple so
+# concurrent loggers never see a mismatched pair.
+_last_stamp: Tuple[int, str] = (-1, "")
+
+
+def _clock_stamp(now: Optional[float] = None) -> str:
+    """Local "HH:MM:SS" for `now` (default: current time), formatted at most once per second."""
+    global _last_stamp
+    sec = int(time.time() if now is None else now)
+    cached_sec, text = _last_stamp
+    if sec != cached_sec:
+        text = time.strftime("%H:%M:%S", time.localtime(sec))
+        _last_stamp = (sec, text)
+    return text
+
 
 class _GenerationCanceled(Exception):
     pass
@@ -30,11 +58,21 @@ class _GenerationCanceled(Exception):
 class KeyboardToggle:
     """Minimal keyboard listener that works on Windows-first, with fallbacks."""
 
+    # Probing imports `keyboard`, which can be slow; do it once per process.
+    _cached_backend: ClassVar[Optional[str]] = None
+
     def __init__(self, key: str = "r"):
         self.key = key
         self.backend = self._detect_backend()
 
-    def _detect_backend(self) -> str:
+    @classmethod
+    def _detect_backend(cls) -> str:
+        if cls._cached_backend is None:
+            cls._cached_backend = cls._probe_backend()
+        return cls._cached_backend
+
+    @staticmethod
+    def _probe_backend() -> str:
         try:
             import keyboard  # type: ignore  # noqa: F401
             return "keyboard"
@@ -47,6 +85,9 @@ class KeyboardToggle:
                     return "stdin"
             return "stdin"
 
+    # Upper bound on how long a cancel can go unnoticed while waiting.
+    CANCEL_POLL_S = 0.25
+
     def wait_for_press(self, message: str, cancel_event: threading.Event) -> bool:
         print(message)
         try:
@@ -57,78 +98,397 @@ class KeyboardToggle:
                     pressed.set()
                 hook = keyboard.on_press_key(self.key, _on_key, suppress=False)
                 try:
-                    while not cancel_event.is_set() and not pressed.is_set():
-                        time.sleep(0.05)
+                    return self._wait(pressed, cancel_event)
                 finally:
                     keyboard.unhook(hook)
-                return pressed.is_set()
             if self.backend == "msvcrt":
-                import msvcrt  # type: ignore
-                while not cancel_event.is_set():
-                    if msvcrt.kbhit():
-                        ch = msvcrt.getwch()
-                        if ch.lower() == self.key.lower():
-                            return True
-                    time.sleep(0.05)
-                return False
-            if cancel_event.is_set():
-                return False
-            input(f"{message} (press Enter to continue)")
-            return True
+                reader, key = _console_keys(), self.key.lower()
+            else:
+                if cancel_event.is_set():
+                    return False
+                print("(press Enter to continue)", flush=True)
+                reader, key = _stdin_lines(), "\n"
+            pressed = reader.subscribe(key)
+            try:
+                return self._wait(pressed, cancel_event)
+            finally:
+                reader.unsubscribe(pressed)
         except KeyboardInterrupt:
             cancel_event.set()
             return False
 
+    def _wait(self, pressed: threading.Event, cancel_event: threading.Event) -> bool:
+        # The key reader wakes us directly; the timeout is only for cancels.
+        while not pressed.wait(self.CANCEL_POLL_S):
+            if cancel_event.is_set():
+                break
+        return pressed.is_set()
+
+
+class _ConsoleKeyReader:
+    """
+    Single daemon thread blocked in a console read (msvcrt.getwch() or a stdin
+    line), fanning each key out to whoever is waiting for it. Sharing one
+    reader keeps the record and play toggles from stealing each other's
+    keystrokes.
+    """
+
+    def __init__(self, read_key):
+        self._read_key = read_key
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[str, threading.Event]] = []
+        self._handlers: List[Callable[[str], None]] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, key: str) -> threading.Event:
+        evt = threading.Event()
+        with self._lock:
+            self._waiters.append((key, evt))
+            self._ensure_thread()
+        return evt
+
+    def unsubscribe(self, evt: threading.Event) -> None:
+        with self._lock:
+            self._waiters = [w for w in self._waiters if w[1] is not evt]
+
+    def add_handler(self, handler: Callable[[str], None]) -> None:
+        """Call `handler(key)` for every key read, until remove_handler()."""
+        with self._lock:
+            self._handlers.append(handler)
+            self._ensure_thread()
+
+    def remove_handler(self, handler: Callable[[str], None]) -> None:
+        with self._lock:
+            self._handlers = [h for h in self._handlers if h is not handler]
+
+    def _ensure_thread(self) -> None:
+        # Called with the lock held.
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="console-keys", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                ch = self._read_key().lower()
+            except Exception as e:
+                logger.debug(f"Console key reader stopped: {e}")
+                with self._lock:
+                    self._thread = None
+                return
+            with self._lock:
+                for key, evt in self._waiters:
+                    if key == ch:
+                        evt.set()
+                handlers = list(self._handlers)
+            for handler in handlers:
+                try:
+                    handler(ch)
+                except Exception:
+                    logger.exception(f"Console key handler failed on {ch!r}")
+
+
+_console_key_reader: Optional[_ConsoleKeyReader] = None
+
+
+def _console_keys() -> _ConsoleKeyReader:
+    global _console_key_reader
+    if _console_key_reader is None:
+        import msvcrt  # type: ignore
+        _console_key_reader = _ConsoleKeyReader(msvcrt.getwch)
+    return _console_key_reader
+
+
+def _read_stdin_line() -> str:
+    if not sys.stdin.readline():
+        raise EOFError("stdin closed")
+    return "\n"
+
+
+_stdin_line_reader: Optional[_ConsoleKeyReader] = None
+
+
+def _stdin_lines() -> _ConsoleKeyReader:
+    global _stdin_line_reader
+    if _stdin_line_reader is None:
+        _stdin_line_reader = _ConsoleKeyReader(_read_stdin_line)
+    return _stdin_line_reader
+
+
+class _KeyDispatcher:
+    """
+    One key listener for a whole session. The keyboard hooks (or console
+    reader handler) are installed once; each phase arms an Event for its key
+    and the next press of that key sets it and wakes the session's tick.
+    Replaces a wait thread plus hook registration per record/play phase.
+    """
+
+    def __init__(self, backend: str, keys: Iterable[str], tick: threading.Event):
+        self.backend = backend
+        self._tick = tick
+        self._lock = threading.Lock()
+        self._armed: Dict[str, threading.Event] = {}
+        self._hooks = []
+        self._reader: Optional[_ConsoleKeyReader] = None
+        if backend == "keyboard":
+            import keyboard  # type: ignore
+            for key in {k.lower() for k in keys}:
+                self._hooks.append(keyboard.on_press_key(key, lambda _e, k=key: self._fire(k), suppress=False))
+        else:
+            self._reader = _console_keys() if backend == "msvcrt" else _stdin_lines()
+            self._reader.add_handler(self._on_console_key)
+
+    def arm(self, key: str, event: threading.Event, message: str) -> None:
+        print(message)
+        if self.backend == "stdin":
+            print("(press Enter to continue)", flush=True)
+        with self._lock:
+            self._armed[key.lower()] = event
+
+    def disarm(self, event: threading.Event) -> None:
+        with self._lock:
+            self._armed = {k: e for k, e in self._armed.items() if e is not event}
+
+    def close(self) -> None:
+        if self._hooks:
+            import keyboard  # type: ignore
+            for hook in self._hooks:
+                keyboard.unhook(hook)
+            self._hooks = []
+        if self._reader:
+            self._reader.remove_handler(self._on_console_key)
+            self._reader = None
+        with self._lock:
+            self._armed.clear()
+
+    def _on_console_key(self, ch: str) -> None:
+        if self.backend == "stdin":
+            # A line of input is the only "key"; it fires whatever is armed.
+            with self._lock:
+                events = list(self._armed.values())
+                self._armed.clear()
+            for event in events:
+                event.set()
+            if events:
+                self._tick.set()
+            return
+        self._fire(ch)
+
+    def _fire(self, key: str) -> None:
+        with self._lock:
+            event = self._armed.pop(key, None)
+        if event is not None:
+            event.set()
+            self._tick.set()
+
 
 def infer_bpm_from_onsets(messages: Iterable[TimestampedMidiMsg]) -> Optional[float]:
-    onsets = [m.timestamp for m in messages if m.msg_type == "note_on" and m.velocity and m.velocity > 0]
-    if len(onsets) < 2:
-        return None
-    deltas = [b - a for a, b in zip(onsets[:-1], onsets[1:]) if b > a]
+    return infer_bpm_from_onset_times(m.timestamp for m in messages if m.msg_type == "note_on" and m.velocity)
+
+
+def infer_bpm_from_onset_times(onsets: Iterable[float]) -> Optional[float]:
+    # One streaming pass: consecutive pairs -> positive deltas -> median.
+    deltas = [b - a for a, b in itertools.pairwise(onsets) if b > a]
     if not deltas:
         return None
     bpm = 60.0 / statistics.median(deltas)
     return max(30.0, min(bpm, 240.0))
 
 
+# Playback sleeps until this close to each deadline and spins the rest, since
+# OS sleeps (~15.6 ms ticks on Windows) overshoot. The spin yields with
+# sleep(0) each pass so it never holds the GIL against capture or the UI.
+# Long gaps are slept in slices so stop requests and progress stay responsive.
+_SPIN_NS = 1_500_000
+_MAX_SLEEP_S = 0.05
+
+
+def _build_schedule(mid: mido.MidiFile) -> Tuple[array, list, float]:
+    """
+    Walk the file once: absolute send times (ns from start) and messages for
+    the types playback forwards, plus the total length in seconds. Filtering
+    here keeps the timed send loop free of per-message type checks.
+    """
+    abs_ns = array("q")
+    msgs = []
+    t = 0.0
+    for msg in mid:  # tracks merged, msg.time already tempo-converted to seconds
+        t += msg.time
+        if msg.type in _KEEP_TYPES:
+            abs_ns.append(round(t * 1e9))
+            msgs.append(msg)
+    return abs_ns, msgs, t
+
+
+def _sleep_until(deadline_ns: int, stop_event=None) -> bool:
+    """Wait for a perf_counter_ns deadline; False if stop_event fired first."""
+    while True:
+        slack = deadline_ns - time.perf_counter_ns()
+        if slack <= _SPIN_NS:
+            break
+        time.sleep(min((slack - _SPIN_NS) * 1e-9, _MAX_SLEEP_S))
+        if stop_event and stop_event.is_set():
+            return False
+    while time.perf_counter_ns() < deadline_ns:
+        time.sleep(0)
+    return True
+
+
 def _play_midi_file(midi_path: str, out_port, progress_cb=None, duration_cb=None, stop_event=None) -> Tuple[int, float]:
-    import mido
-    mid = mido.MidiFile(midi_path)
-    total_time = mid.length
+    abs_ns, msgs, total_time = _build_schedule(mido.MidiFile(midi_path))
     if duration_cb and total_time > 0:
         duration_cb(total_time)
     if total_time > 0:
         print(f"STATUS:play_duration:{total_time:.3f}", flush=True)
+    send = out_port.send  # bound once; called for every message below
     sent = 0
-    elapsed = 0.0
     last_report = -1.0
     print("STATUS:playing:0.0", flush=True)
-    stopped_printed = False
-    for msg in mid.play():
-        if stop_event and stop_event.is_set():
-            logger.info("[playback] Stop event received — MIDI feed halted")
-            print("[playback] Stop event received — MIDI feed halted")
-            print("STATUS:stopped", flush=True)
-            stopped_printed = True
+    stopped = False
+    # Deadlines are absolute from one origin, so sleep overshoot never accumulates.
+    t0 = time.perf_counter_ns()
+    for when, msg in zip(abs_ns, msgs):
+        if (stop_event and stop_event.is_set()) or not _sleep_until(t0 + when, stop_event):
+            stopped = True
             break
-        elapsed += msg.time
-        if hasattr(msg, "type") and msg.type in ("note_on", "note_off", "control_change"):
-            out_port.send(msg)
-            sent += 1
+        send(msg)
+        sent += 1
+        elapsed = when * 1e-9
         if total_time > 0 and elapsed - last_report >= 0.05:
             progress = min(1.0, elapsed / total_time)
             if progress_cb:
                 progress_cb(progress)
             print(f"STATUS:playing:{progress:.3f}", flush=True)
             last_report = elapsed
-    if not stopped_printed:
-        print("STATUS:stopped", flush=True)
+    if stopped:
+        logger.info("[playback] Stop event received — MIDI feed halted")
+        print("[playback] Stop event received — MIDI feed halted")
+    print("STATUS:stopped", flush=True)
     return sent, total_time
 
 
+def _boost_thread_priority(label: str, realtime: bool = True) -> None:
+    """
+    Best-effort priority bump for the calling thread (MIDI in/out timing).
+    Windows: THREAD_PRIORITY_ABOVE_NORMAL. Linux: SCHED_FIFO, which needs
+    CAP_SYS_NICE or an rtprio limit; otherwise the thread keeps its default.
+    Pass realtime=False for threads that spin in Python: a SCHED_FIFO thread
+    holding the GIL would starve every other thread, so they are only
+    raised on Windows.
+    """
+    try:
+        if os.name == "nt":
+            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 1):
+                raise ctypes.WinError()  # type: ignore[attr-defined]
+        elif realtime and hasattr(os, "sched_setscheduler"):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+        else:
+            return
+        logger.debug(f"[{label}] Thread priority raised")
+    except Exception as e:
+        logger.debug(f"[{label}] Could not raise thread priority: {e}")
+
+
+def _safe_unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class _PlaybackJob:
+    __slots__ = ("midi_path", "kwargs", "stop_event", "wake", "done", "result")
+
+    def __init__(self, midi_path: str, stop_event: threading.Event, kwargs: dict, wake: Optional[threading.Event] = None):
+        self.midi_path = midi_path
+        self.kwargs = kwargs
+        self.stop_event = stop_event
+        self.wake = wake
+        self.done = threading.Event()
+        self.result: Tuple[int, float] = (0, 0.0)
+
+
+class _MidiSender:
+    """
+    Owns MIDI output timing on a dedicated thread, so playback never blocks
+    the session's control loop. Jobs run one at a time; starting a new one
+    stops whatever is playing first.
+    """
+
+    def __init__(self, out_port):
+        self._out_port = out_port
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._current: Optional[_PlaybackJob] = None
+        self._thread = threading.Thread(target=self._run, name="midi-tx", daemon=True)
+        self._thread.start()
+
+    def play(
+        self,
+        midi_path: str,
+        stop_event: Optional[threading.Event] = None,
+        wake: Optional[threading.Event] = None,
+        **kwargs,
+    ) -> _PlaybackJob:
+        """Queue `midi_path`; `wake` is set once the job has finished."""
+        job = _PlaybackJob(midi_path, stop_event or threading.Event(), kwargs, wake)
+        current = self._current
+        if current is not None and not current.done.is_set():
+            current.stop_event.set()
+        self._current = job
+        self._jobs.put(job)
+        return job
+
+    def busy(self) -> bool:
+        current = self._current
+        return current is not None and not current.done.is_set()
+
+    def close(self, timeout: float = 2.0) -> None:
+        current = self._current
+        if current is not None and not current.done.is_set():
+            current.stop_event.set()
+        self._jobs.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        _boost_thread_priority("midi-tx", realtime=False)
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                if not job.stop_event.is_set():
+                    job.result = _play_midi_file(job.midi_path, self._out_port, stop_event=job.stop_event, **job.kwargs)
+            except Exception as e:
+                logger.exception(f"[playback] Failed to play {job.midi_path}: {e}")
+            finally:
+                job.done.set()
+                if job.wake is not None:
+                    job.wake.set()
+
+
+class _PhaseEvents(NamedTuple):
+    """Events the current run() phase is waiting on; command handlers set them."""
+    stop: Optional[threading.Event]
+    start: Optional[threading.Event]
+    play: Optional[threading.Event]
+    play_callback: Optional[Callable[[], None]]
+
+
 class ManualModeSession:
     """Keyboard-driven record -> prompt -> generate -> play pipeline."""
 
+    # Slots reserved per take so typical recordings never resize mid-capture.
+    CAPTURE_PREALLOC = 4096
+    # Longest the control loops sleep without a wake-up; bounds how late an
+    # external cancel_event.set() is noticed. Commands and keys wake them
+    # immediately via _tick.
+    IDLE_WAIT_S = 0.25
+    # Fallback poll when command_queue cannot signal _tick (plain queue.Queue).
+    COMMAND_POLL_S = 0.02
+    # UI log lines buffered for the log thread before the oldest are dropped.
+    LOG_BACKLOG = 256
+
     def __init__(
         self,
         in_port_name: str,
@@ -186,8 +546,8 @@ class ManualModeSession:
         self.play_gate = True
         self.feedback_manager = feedback_manager
         self.pending_output_path = None
-        self._msg_count = 0
-        self._note_on_count = 0
+        self._rec_t0_ns = 0
+        self._callback_boosted = False
         self.state = "IDLE"
 
         self.cancel_event = threading.Event()
@@ -195,14 +555,94 @@ class ManualModeSession:
         self.generation_cancel_event = threading.Event()
         self.skip_pending_event = threading.Event()
         self.recording_flag = threading.Event()
-        self.recorded: List[TimestampedMidiMsg] = []
+        # Single wake-up for the control loops: key threads, queued commands
+        # and the max-seconds deadline all end a _tick.wait().
+        self._tick = threading.Event()
+        self._wait_cap = self.IDLE_WAIT_S
+        if command_queue is not None:
+            if hasattr(command_queue, "add_listener"):
+                command_queue.add_listener(self._tick)
+            else:
+                self._wait_cap = self.COMMAND_POLL_S
+        self.capture = CaptureBuffer()
         self.start_time: Optional[float] = None
         self.stop_time: Optional[float] = None
 
         self.toggle = KeyboardToggle(manual_key)
         self.in_port = None
         self.out_port = None
-        self.midi_thread = None
+        self._sender: Optional[_MidiSender] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self._keys: Optional[_KeyDispatcher] = None
+        # UI log lines waiting for the log thread; oldest dropped if it falls behind.
+        self._log_pending = SignalQueue(maxlen=self.LOG_BACKLOG)
+        self._log_thread: Optional[threading.Thread] = None
+        # OSC status is coalesced: transitions within one step collapse into
+        # a single send of the final state (see _flush_status).
+        self._pending_status: Optional[str] = None
+        # Recent stop-to-ready times (ms), summarised when the session ends.
+        self._turnaround_ms: deque = deque(maxlen=128)
+        # UI/OSC command name -> handler(payload, phase events); built once.
+        self._cmd_handlers = {
+            "toggle_record": self._cmd_toggle_record,
+            "record": self._cmd_record,
+            "record_start": self._cmd_record_start,
+            "record_stop": self._cmd_record_stop,
+            "cancel": self._cmd_cancel,
+            "play_last": self._cmd_play_last,
+            "cancel_playback": self._cmd_cancel_playback,
+            "play": self._cmd_play,
+        }
+
+    def _io_pool(self) -> ThreadPoolExecutor:
+        """Single worker for prompt-file I/O, created on first use."""
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="manual-io")
+        return self._io_executor
+
+    def _key_dispatcher(self) -> _KeyDispatcher:
+        if self._keys is None:
+            self._keys = _KeyDispatcher(self.toggle.backend, (self.manual_key, self.play_key), self._tick)
+        return self._keys
+
+    def _note_turnaround(self, stop_ns: int) -> None:
+        """Record stop -> output ready, the part of the loop the user waits on."""
+        ms = (time.perf_counter_ns() - stop_ns) / 1e6
+        self._turnaround_ms.append(ms)
+        logger.info(f"[manual] Stop-to-ready latency: {ms:.0f} ms")
+
+    def _log_turnaround_summary(self) -> None:
+        samples = self._turnaround_ms
+        if len(samples) < 2:
+            return
+        cuts = statistics.quantiles(samples, n=20, method="inclusive")
+        logger.info(
+            f"[manual] Stop-to-ready over {len(samples)} takes: p50={statistics.median(samples):.0f} ms, p95={cuts[18]:.0f} ms"
+        )
+
+    def _post_status(self, status: str) -> None:
+        """Record the latest state for OSC; sent by the next _flush_status()."""
+        self._pending_status = status
+
+    def _flush_status(self) -> None:
+        """Send the latest state posted since the previous flush, if any."""
+        # No dedupe against earlier flushes: other code sends status too, and a
+        # send can be dropped while the OSC client is backed off.
+        status, self._pending_status = self._pending_status, None
+        if status is None or not self.osc_status_cb:
+            return
+        self.osc_status_cb(status)
+
+    def _discard_file(self, path: str) -> None:
+        """Delete a finished temp file on the io worker; a slow unlink (e.g. AV scan) never delays state changes."""
+        self._io_pool().submit(_safe_unlink, path)
+
+    def _prompt_path(self) -> str:
+        """Per-session prompt file, overwritten each take and removed with the session's temp dir."""
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="aria_manual_")
+        return os.path.join(self._tmpdir.name, "prompt.mid")
 
     def _resolve_max_tokens(self) -> Optional[int]:
         if self.session_state:
@@ -214,7 +654,6 @@ class ManualModeSession:
     @staticmethod
     def _resolve_port(name: str, kind: str) -> str:
         """Return the first port whose name starts with 'name' (case-insensitive)."""
-        import mido
         available = mido.get_input_names() if kind == "input" else mido.get_output_names()
         matched = [p for p in available if p.lower().startswith(name.lower())]
         if matched:
@@ -226,15 +665,19 @@ class ManualModeSession:
         )
 
     def _open_ports(self) -> None:
-        import mido
         in_name = self._resolve_port(self.in_port_name, "input")
         out_name = self._resolve_port(self.out_port_name, "output")
-        self.in_port = mido.open_input(in_name)
+        self._callback_boosted = False
+        self.in_port = mido.open_input(in_name, callback=self._on_midi)
         self.out_port = mido.open_output(out_name)
+        self._sender = _MidiSender(self.out_port)
         logger.info(f"Manual mode ports opened: IN={in_name}, OUT={out_name}")
         print("STATUS:ports_ready", flush=True)
 
     def _close_ports(self) -> None:
+        if self._sender:
+            self._sender.close()
+            self._sender = None
         try:
             if self.in_port:
                 self.in_port.close()
@@ -246,37 +689,37 @@ class ManualModeSession:
         finally:
             self.out_port = None
 
-    def _midi_loop(self) -> None:
+    def _reset_capture(self, capacity: int = 0) -> None:
+        """Start a fresh take with `capacity` empty slots ready for the MIDI callback."""
+        self.capture = CaptureBuffer(capacity)
+
+    def _mark_take_start(self) -> None:
+        # Set before recording_flag so the callback never sees a stale origin.
+        self._rec_t0_ns = time.perf_counter_ns()
+        self.start_time = self._rec_t0_ns * 1e-9
+
+    def _on_midi(self, msg) -> None:
+        """rtmidi input callback: runs on the backend thread as each message arrives."""
+        now_ns = time.perf_counter_ns()
         try:
-            while not self.cancel_event.is_set():
-                if self.in_port is None:
-                    break
-                for msg in self.in_port.iter_pending():
-                    if not self.recording_flag.is_set():
-                        continue
-                    if msg.type not in ("note_on", "note_off", "control_change"):
-                        continue
-                    timestamp = time.monotonic()
-                    data = {"msg_type": msg.type, "timestamp": timestamp, "pulse": None}
-                    if hasattr(msg, "note"):
-                        data["note"] = msg.note
-                    if hasattr(msg, "velocity"):
-                        data["velocity"] = msg.velocity
-                    if msg.type == "control_change":
-                        data["control"] = msg.control
-                        data["value"] = msg.value
-                    self.recorded.append(TimestampedMidiMsg(**data))
-                    self._msg_count += 1
-                    if msg.type == "note_on" and getattr(msg, "velocity", 0) > 0:
-                        self._note_on_count += 1
-                time.sleep(0.001)
+            if not self._callback_boosted:
+                # The backend's callback thread is only reachable from inside it.
+                self._callback_boosted = True
+                _boost_thread_priority("midi-in")
+            if not self.recording_flag.is_set():
+                return
+            # One dict probe both filters the type and yields its code.
+            kind = KIND_CODES.get(msg.type)
+            if kind is None:
+                return
+            ts_us = (now_ns - self._rec_t0_ns) // 1000
+            # The kind fixes which attributes exist, so no hasattr probing.
+            if kind == CONTROL_CHANGE:
+                self.capture.append(ts_us, kind, msg.control, msg.value)
+            else:
+                self.capture.append(ts_us, kind, msg.note, msg.velocity)
         except Exception as e:
-            logger.exception(f"Manual MIDI loop error: {e}")
-            self.cancel_event.set()
-
-    def _start_midi_thread(self) -> None:
-        self.midi_thread = threading.Thread(target=self._midi_loop, daemon=True)
-        self.midi_thread.start()
+            logger.exception(f"Manual MIDI callback error: {e}")
 
     def _drain_commands(
         self,
@@ -287,93 +730,89 @@ class ManualModeSession:
     ):
         if not self.command_queue:
             return
+        waits = _PhaseEvents(stop_key_event, start_event, play_event, play_callback)
+        handlers = self._cmd_handlers
         try:
             while True:
                 cmd, payload = self.command_queue.get_nowait()
-                if cmd == "toggle_record":
-                    if self.recording_flag.is_set():
-                        if stop_key_event:
-                            stop_key_event.set()
-                    else:
-                        if start_event:
-                            start_event.set()
-                        else:
-                            self._log_ui("Record start ignored (not armed)")
-                elif cmd == "record":
-                    if payload:
-                        if not self.recording_flag.is_set():
-                            if start_event:
-                                start_event.set()
-                            else:
-                                self._log_ui("Record start ignored (not armed)")
-                    else:
-                        if stop_key_event:
-                            stop_key_event.set()
-                elif cmd == "record_start":
-                    if self.recording_flag.is_set():
-                        self._log_ui("Already recording; record_start ignored")
-                    else:
-                        if start_event:
-                            start_event.set()
-                        else:
-                            self._log_ui("Record start ignored (not armed)")
-                elif cmd == "record_stop":
-                    if not self.recording_flag.is_set():
-                        self._log_ui("Not recording; record_stop ignored")
-                    elif stop_key_event:
-                        stop_key_event.set()
-                elif cmd == "cancel":
-                    if stop_key_event:
-                        stop_key_event.set()
-                    self.generation_cancel_event.set()
-                    self.skip_pending_event.set()
-                    self.recorded.clear()
-                    self._log_ui("Canceled")
-                    if self.session_state:
-                        self.session_state.set_status("IDLE")
-                        self.session_state.has_pending_output = False
-                elif cmd == "play_last":
-                    if self.session_state and self.session_state.last_output_path and self.out_port:
-                        self._log_ui("Playing last output (UI)")
-                        _play_midi_file(self.session_state.last_output_path, self.out_port)
-                elif cmd == "cancel_playback":
-                    self.playback_cancel_event.set()
-                    self._log_ui("Playback canceled")
-                elif cmd == "play":
-                    if play_event:
-                        play_event.set()
-                    elif play_callback:
-                        play_callback()
-                    else:
-                        self._handle_play_request()
+                handler = handlers.get(cmd)
+                if handler is not None:
+                    handler(payload, waits)
                 self.command_queue.task_done()
         except queue.Empty:
             pass
 
-    def _start_immediate_record(self, stop_key_event: Optional[threading.Event] = None):
+    def _request_start(self, waits: _PhaseEvents) -> None:
+        if waits.start:
+            waits.start.set()
+        else:
+            self._log_ui("Record start ignored (not armed)")
+
+    def _cmd_toggle_record(self, payload, waits: _PhaseEvents) -> None:
+        if self.recording_flag.is_set():
+            if waits.stop:
+                waits.stop.set()
+        else:
+            self._request_start(waits)
+
+    def _cmd_record(self, payload, waits: _PhaseEvents) -> None:
+        if payload:
+            if not self.recording_flag.is_set():
+                self._request_start(waits)
+        elif waits.stop:
+            waits.stop.set()
+
+    def _cmd_record_start(self, payload, waits: _PhaseEvents) -> None:
+        if self.recording_flag.is_set():
+            self._log_ui("Already recording; record_start ignored")
+        else:
+            self._request_start(waits)
+
+    def _cmd_record_stop(self, payload, waits: _PhaseEvents) -> None:
+        if not self.recording_flag.is_set():
+            self._log_ui("Not recording; record_stop ignored")
+        elif waits.stop:
+            waits.stop.set()
+
+    def _cmd_cancel(self, payload, waits: _PhaseEvents) -> None:
+        if waits.stop:
+            waits.stop.set()
+        self.generation_cancel_event.set()
+        self.skip_pending_event.set()
+        self._reset_capture()
+        self._log_ui("Canceled")
+        if self.session_state:
+            self.session_state.set_status("IDLE")
+            self.session_state.has_pending_output = False
+
+    def _cmd_play_last(self, payload, waits: _PhaseEvents) -> None:
+        if self.session_state and self.session_state.last_output_path and self._sender:
+            self._log_ui("Playing last output (UI)")
+            self._sender.play(self.session_state.last_output_path, wake=self._tick)
+
+    def _cmd_cancel_playback(self, payload, waits: _PhaseEvents) -> None:
+        self.playback_cancel_event.set()
+        self._log_ui("Playback canceled")
+
+    def _cmd_play(self, payload, waits: _PhaseEvents) -> None:
+        if waits.play:
+            waits.play.set()
+        elif waits.play_callback:
+            waits.play_callback()
+        else:
+            self._handle_play_request()
+
+    def _start_immediate_record(self):
+        # Stop requests arrive through _drain_commands (toggle_record sets the
+        # caller's stop event), so no extra command reader is needed here.
         if self.recording_flag.is_set():
             return
-        self.recorded.clear()
-        self._msg_count = 0
-        self._note_on_count = 0
+        self._reset_capture(self.CAPTURE_PREALLOC)
+        self._mark_take_start()
         self.recording_flag.set()
-        self.start_time = time.monotonic()
         if self.session_state:
             self.session_state.set_status("RECORDING")
         self._log_ui("Recording started (UI)")
-        if stop_key_event is None:
-            return
-
-        def _wait_stop():
-            while not self.cancel_event.is_set():
-                try:
-                    cmd, _ = self.command_queue.get(timeout=0.1)
-                    if cmd == "toggle_record":
-                        stop_key_event.set()
-                        break
-                except queue.Empty:
-                    continue
-        threading.Thread(target=_wait_stop, daemon=True).start()
 
     def _handle_play_request(self) -> bool:
         """Play pending output in a single shared path (keyboard + OSC)."""
@@ -384,64 +823,76 @@ class ManualModeSession:
             self._log_ui("No pending output to play")
             logger.info("[manual] Play requested but no pending output.")
             return False
-        if not self.out_port:
+        if not self._sender:
             logger.warning("[manual] Play requested but output port is unavailable.")
             return False
         self._log_ui("Play requested")
         self.playback_cancel_event.clear()
-        sent, total = _play_midi_file(path, self.out_port, progress_cb=self.osc_playback_progress_cb, duration_cb=self.osc_playback_duration_cb, stop_event=self.playback_cancel_event)
+        job = self._sender.play(
+            path,
+            stop_event=self.playback_cancel_event,
+            wake=self._tick,
+            progress_cb=self.osc_playback_progress_cb,
+            duration_cb=self.osc_playback_duration_cb,
+        )
+        # The sender thread does the timing; this loop keeps applying commands
+        # (a play_last replaces the take, cancel_playback stops it) until the
+        # sender is idle, and only then discards the file.
+        while self._sender.busy():
+            if self.cancel_event.is_set():
+                self.playback_cancel_event.set()
+            self._tick.clear()
+            self._drain_commands(play_callback=self._ignore_play_while_playing)
+            if self._sender.busy():
+                self._wait_tick()
+        sent, total = job.result
         if self.osc_playback_stopped_cb:
             self.osc_playback_stopped_cb()
         logger.info(f"[manual] Played pending MIDI ({sent} msgs, {total:.2f}s)")
         if self.osc_log_cb:
             self.osc_log_cb(f"Played pending MIDI ({sent} msgs, {total:.2f}s)")
-        try:
-            os.unlink(path)
-        except Exception:
-            pass
+        self._discard_file(path)
         self.pending_output_path = None
         if self.session_state:
             self.session_state.has_pending_output = False
             self.session_state.set_status("IDLE")
             self.session_state.set_last_output(None)
-        if self.osc_status_cb:
-            self.osc_status_cb("IDLE")
+        self._post_status("IDLE")
+        self._flush_status()
         return True
 
-    def _wait_for_play(self):
-        """Block until either manual 'p' or OSC /aria/play arrives, then play once."""
-        play_event = threading.Event()
-
-        def _wait_keyboard_play():
-            prompt = f"Output ready. Press '{self.play_key}' to play."
-            if self.play_toggle.wait_for_press(prompt, self.cancel_event):
-                play_event.set()
+    def _ignore_play_while_playing(self) -> None:
+        self._log_ui("Already playing")
 
-        threading.Thread(target=_wait_keyboard_play, daemon=True).start()
+    def _wait_for_play(self, play_event: Optional[threading.Event] = None):
+        """Block until either manual 'p' or OSC /aria/play arrives (or already has), then play once."""
+        play_event = play_event or threading.Event()
+        keys = self._key_dispatcher()
+        keys.arm(self.play_key, play_event, f"Output ready. Press '{self.play_key}' to play.")
 
-        while not self.cancel_event.is_set() and not self.skip_pending_event.is_set():
-            self._drain_commands(play_event=play_event)
-            if play_event.is_set():
-                self._handle_play_request()
-                break
-            time.sleep(0.05)
+        try:
+            while not self.cancel_event.is_set() and not self.skip_pending_event.is_set():
+                self._tick.clear()
+                self._drain_commands(play_event=play_event)
+                if play_event.is_set():
+                    self._handle_play_request()
+                    break
+                self._wait_tick()
+        finally:
+            keys.disarm(play_event)
 
         if self.skip_pending_event.is_set():
             logger.info("[manual] Pending output canceled — returning to record")
             print("[manual] Pending output canceled — returning to record")
             self.skip_pending_event.clear()
             if self.pending_output_path:
-                try:
-                    os.unlink(self.pending_output_path)
-                except Exception:
-                    pass
+                self._discard_file(self.pending_output_path)
             self.pending_output_path = None
             if self.session_state:
                 self.session_state.has_pending_output = False
                 self.session_state.set_status("IDLE")
                 self.session_state.set_last_output(None)
-            if self.osc_status_cb:
-                self.osc_status_cb("IDLE")
+            self._post_status("IDLE")
             self._log_ui("Pending output discarded — ready to record")
 
         # Ensure we leave READY state if globally canceled.
@@ -450,76 +901,88 @@ class ManualModeSession:
             self.session_state.set_status("IDLE")
             self.session_state.set_last_output(None)
             self.pending_output_path = None
+        self._flush_status()
+
+    def _wait_tick(self) -> None:
+        """Sleep until something calls _tick.set() or the idle cap expires."""
+        self._tick.wait(self._wait_cap)
+
+    def _stop_at_max_seconds(self, stop_key_event: threading.Event) -> None:
+        if stop_key_event.is_set():
+            return
+        logger.info(f"[manual] Max seconds reached ({self.max_seconds}s); stopping.")
+        stop_key_event.set()
+        self._tick.set()
 
     def _begin_recording(self):
         """Shared start logic for keyboard + OSC."""
-        self.recorded.clear()
-        self._msg_count = 0
-        self._note_on_count = 0
+        self._reset_capture(self.CAPTURE_PREALLOC)
         self.skip_pending_event.clear()
         self.playback_cancel_event.clear()
+        self._mark_take_start()
         self.recording_flag.set()
-        self.start_time = time.monotonic()
         logger.info(f"[manual] Recording started at {self.start_time:.3f}")
         self._log_ui("Recording started")
         if self.session_state:
             self.session_state.set_status("RECORDING")
             self.session_state.set_recording(True)
-        if self.osc_status_cb:
-            self.osc_status_cb("RECORDING")
+        self._post_status("RECORDING")
+        self._flush_status()
 
     def _finish_recording_and_generate(self):
         """Stop, generate, and arm playback (prompting for 'p')."""
         self.recording_flag.clear()
-        self.stop_time = time.monotonic()
+        stop_ns = time.perf_counter_ns()
+        self.stop_time = stop_ns * 1e-9
+        capture = self.capture
         duration = (self.stop_time - self.start_time) if self.start_time else 0.0
         logger.info(f"[manual] Recording stopped at {self.stop_time:.3f} (duration={duration:.2f}s)")
-        self._log_ui(f"Recording stopped (events={self._msg_count}, note_on={self._note_on_count})")
+        onsets = list(capture.onset_times())
+        self._log_ui(f"Recording stopped (events={len(capture)}, note_on={len(onsets)})")
         if self.session_state:
             self.session_state.set_status("GENERATING")
             self.session_state.set_recording(False)
-        if self.osc_status_cb:
-            self.osc_status_cb("GENERATING")
+        self._post_status("GENERATING")
 
-        if not self.recorded:
+        if not capture:
             logger.warning("[manual] No MIDI captured. Nothing to generate.")
             self._log_ui("No MIDI captured. Check Ableton routing/monitor on ARIA_IN or competing readers.")
             if self.session_state:
                 self.session_state.set_status("IDLE")
                 self.session_state.has_pending_output = False
-            if self.osc_status_cb:
-                self.osc_status_cb("IDLE")
+            self._post_status("IDLE")
             return
 
-        bpm = infer_bpm_from_onsets(self.recorded)
+        bpm = infer_bpm_from_onset_times(onsets)
         if bpm:
             logger.info(f"[manual] Estimated BPM from onsets: {bpm:.2f}")
             if self.max_bars:
                 max_duration = (60.0 / bpm) * self.beats_per_bar * self.max_bars
                 if duration > max_duration:
-                    cutoff = (self.start_time or 0) + max_duration
-                    original_len = len(self.recorded)
-                    self.recorded = [m for m in self.recorded if m.timestamp <= cutoff]
+                    original_len = len(capture)
+                    capture.truncate_after(int(max_duration * 1e6))
                     duration = max_duration
                     logger.info(
-                        f"[manual] Trimmed recording to {self.max_bars} bars ({max_duration:.2f}s); kept {len(self.recorded)}/{original_len} events."
+                        f"[manual] Trimmed recording to {self.max_bars} bars ({max_duration:.2f}s); kept {len(capture)}/{original_len} events."
                     )
         else:
             logger.info("[manual] Could not infer BPM; using default 120 BPM conversion.")
 
-        prompt_midi_path = buffer_to_tempfile_midi(
-            messages=self.recorded,
-            window_seconds=duration,
-            current_bpm=bpm,
-            ticks_per_beat=self.ticks_per_beat,
-        )
-
-        prompt_ticks, prompt_seconds = self._midi_stats(prompt_midi_path)
-        logger.info(
-            f"[manual] Prompt stats: events={len(self.recorded)}, duration={duration:.2f}s, midi_len={prompt_seconds:.2f}s, ticks={prompt_ticks}"
+        # Build and write the prompt file on the io worker while this thread
+        # does the sampling/UI/OSC bookkeeping below.
+        prompt_future = self._io_pool().submit(
+            lambda: buffer_to_tempfile_midi_with_stats(
+                messages=capture.to_messages(),
+                window_seconds=duration,
+                current_bpm=bpm,
+                ticks_per_beat=self.ticks_per_beat,
+                # Timestamps count from the take start, so the window is [0, duration]
+                # even when the take was trimmed to max_bars.
+                now=duration,
+                path=self._prompt_path(),
+            )
         )
 
-        gen_start = time.time()
         temp, top_p, min_p = self.sampling_state.get_values() if self.sampling_state else (0.9, 0.95, None)
         logger.info(f"[GEN] temp={temp:.2f} top_p={top_p:.2f} min_p={min_p if min_p is not None else 0.0:.2f}")
         self._log_ui(
@@ -531,6 +994,13 @@ class ManualModeSession:
         if tokens is not None:
             logger.info(f"[GEN] max_new_tokens={tokens}")
             self._log_ui(f"Max tokens -> {tokens}")
+
+        prompt_midi_path, prompt_ticks, prompt_seconds = prompt_future.result()
+        logger.info(
+            f"[manual] Prompt stats: events={len(capture)}, duration={duration:.2f}s, midi_len={prompt_seconds:.2f}s, ticks={prompt_ticks}"
+        )
+
+        gen_start = time.time()
         self.generation_cancel_event.clear()
         if self.osc_generation_start_cb:
             self.osc_generation_start_cb()
@@ -555,17 +1025,25 @@ class ManualModeSession:
                 print("[manual] Generation interrupted mid-token")
             except Exception as e:
                 logger.exception(f"[manual] Generation error: {e}")
+            finally:
+                self._tick.set()
 
         MAX_GEN_TIMEOUT_S = 90
 
         gen_thread = threading.Thread(target=_run_generate, daemon=True)
+        self._flush_status()  # GENERATING, before the long wait
         print("STATUS:generating", flush=True)
         gen_thread.start()
 
         gen_start_time = time.time()
         last_status_elapsed = -1.0
         timed_out = False
+        # A PLAY that arrives mid-generation is kept and honoured once output is ready.
+        early_play = threading.Event()
         while gen_thread.is_alive():
+            # Keep serving UI/OSC commands so cancel/play_last act immediately.
+            self._tick.clear()
+            self._drain_commands(play_event=early_play)
             if self.generation_cancel_event.is_set() and gen_thread_id[0] is not None:
                 logger.info("[manual] Injecting cancel into generation thread")
                 ctypes.pythonapi.PyThreadState_SetAsyncExc(
@@ -588,7 +1066,10 @@ class ManualModeSession:
             if elapsed - last_status_elapsed >= 0.5:
                 print(f"STATUS:generating:{elapsed:.1f}", flush=True)
                 last_status_elapsed = elapsed
-            time.sleep(0.05)
+            # The generation thread and queued commands both set _tick; the
+            # timeout paces the timeout check and status lines above.
+            if gen_thread.is_alive():
+                self._tick.wait(0.05)
 
         gen_thread.join(timeout=5.0)
         if not timed_out:
@@ -604,31 +1085,25 @@ class ManualModeSession:
             print("[manual] Generation canceled — discarding output")
             self.generation_cancel_event.clear()
             if generated_path:
-                try:
-                    os.unlink(generated_path)
-                except Exception:
-                    pass
+                self._discard_file(generated_path)
             if self.session_state:
                 self.session_state.set_status("IDLE")
                 self.session_state.has_pending_output = False
-            if self.osc_status_cb:
-                self.osc_status_cb("IDLE")
+            self._post_status("IDLE")
             self._log_ui("Generation canceled — ready to record")
             return
         gen_time = time.time() - gen_start
         logger.info(f"[manual] Generation finished in {gen_time:.2f}s")
         if self.session_state:
             self.session_state.set_status("PLAYING")
-        if self.osc_status_cb:
-            self.osc_status_cb("PLAYING")
+        self._post_status("PLAYING")
 
         if not generated_path:
             logger.warning("[manual] Generation returned None; aborting playback.")
             self._log_ui("Generation returned None")
             if self.session_state:
                 self.session_state.set_status("IDLE")
-            if self.osc_status_cb:
-                self.osc_status_cb("IDLE")
+            self._post_status("IDLE")
             return
 
         self._capture_feedback(prompt_midi_path, generated_path, temp, top_p, min_p, tokens)
@@ -639,13 +1114,16 @@ class ManualModeSession:
                 self.session_state.set_last_output(generated_path)
                 self.session_state.has_pending_output = True
                 self.session_state.set_status("READY")
-            if self.osc_status_cb:
-                self.osc_status_cb("READY")
+            self._post_status("READY")
+            self._flush_status()
+            self._note_turnaround(stop_ns)
             self._log_ui("Output ready. Press 'p' to play.")
             logger.info("[MANUAL] Output ready. Press 'p' to play.")
             print("STATUS:awaiting_play", flush=True)
-            self._wait_for_play()
+            self._wait_for_play(early_play)
         else:
+            self._flush_status()
+            self._note_turnaround(stop_ns)
             if self.play_toggle:
                 pressed = self.play_toggle.wait_for_press(
                     f"Press '{self.play_key}' to PLAY generated output, or Ctrl+C to quit.",
@@ -666,25 +1144,41 @@ class ManualModeSession:
                 self.session_state.has_pending_output = False
             if self.osc_log_cb:
                 self.osc_log_cb(f"Played generated MIDI ({sent} msgs, {total:.2f}s)")
-            try:
-                os.unlink(prompt_midi_path)
-            except Exception:
-                pass
-            try:
-                os.unlink(generated_path)
-            except Exception:
-                pass
+            self._discard_file(generated_path)
             if self.session_state:
                 self.session_state.set_status("IDLE")
-            if self.osc_status_cb:
-                self.osc_status_cb("IDLE")
+            self._post_status("IDLE")
 
     def _log_ui(self, msg: str):
-        if self.log_queue:
-            ts = time.strftime("%H:%M:%S")
-            self.log_queue.put(f"[{ts}] {msg}")
-        if self.osc_log_cb:
-            self.osc_log_cb(msg)
+        # Hand off to the log thread: the UI queue and the OSC send must never
+        # stall recording, generation or playback transitions.
+        if not (self.log_queue or self.osc_log_cb):
+            return
+        if self._log_thread is None:
+            self._log_thread = threading.Thread(target=self._log_loop, name="manual-log", daemon=True)
+            self._log_thread.start()
+        self._log_pending.put((msg, time.time()))
+
+    def _log_loop(self) -> None:
+        pending = self._log_pending
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            msg, stamp = item
+            try:
+                if self.log_queue:
+                    self.log_queue.put(f"[{_clock_stamp(stamp)}] {msg}")
+                if self.osc_log_cb:
+                    self.osc_log_cb(msg)
+            except Exception as e:
+                logger.debug(f"UI log delivery failed: {e}")
+
+    def _stop_log_thread(self) -> None:
+        if self._log_thread is not None:
+            self._log_pending.put(None)
+            self._log_thread.join(timeout=1.0)
+            self._log_thread = None
 
     def _capture_feedback(self, prompt_path: str, output_path: str | None, temp, top_p, min_p, tokens):
         if not self.feedback_manager or not output_path:
@@ -714,26 +1208,23 @@ class ManualModeSession:
     def run(self) -> int:
         try:
             self._open_ports()
-            self._start_midi_thread()
+            keys = self._key_dispatcher()
 
             while not self.cancel_event.is_set():
                 stop_key_event = threading.Event()
 
                 # Wait for either keyboard start or UI/OSC record start
                 start_evt = threading.Event()
+                keys.arm(self.manual_key, start_evt, f"Manual mode armed. Press '{self.manual_key}' to START recording.")
 
-                def _wait_keyboard_start():
-                    if self.toggle.wait_for_press(
-                        f"Manual mode armed. Press '{self.manual_key}' to START recording.",
-                        self.cancel_event,
-                    ):
-                        start_evt.set()
-
-                threading.Thread(target=_wait_keyboard_start, daemon=True).start()
-
-                while not self.cancel_event.is_set() and not start_evt.is_set():
+                while not self.cancel_event.is_set():
+                    # Clear before checking, so a wake-up during the checks is kept.
+                    self._tick.clear()
                     self._drain_commands(stop_key_event, start_event=start_evt)
-                    time.sleep(0.05)
+                    if start_evt.is_set():
+                        break
+                    self._wait_tick()
+                keys.disarm(start_evt)
 
                 if self.cancel_event.is_set():
                     break
@@ -743,27 +1234,31 @@ class ManualModeSession:
                 self._begin_recording()
 
                 stop_key_event = threading.Event()
-                threading.Thread(
-                    target=lambda: (self.toggle.wait_for_press(
-                        f"Recording... Press '{self.manual_key}' again to STOP.", stop_key_event), stop_key_event.set()),
-                    daemon=True,
-                ).start()
+                keys.arm(self.manual_key, stop_key_event, f"Recording... Press '{self.manual_key}' again to STOP.")
 
                 if self.max_bars:
                     logger.info(f"[manual] max-bars flag set to {self.max_bars}; will apply after tempo inference if possible.")
 
-                while not self.cancel_event.is_set():
-                    self._drain_commands(stop_key_event)
-                    now = time.monotonic()
-                    if stop_key_event.is_set():
-                        break
-                    if self.max_seconds and self.start_time and (now - self.start_time) >= self.max_seconds:
-                        logger.info(f"[manual] Max seconds reached ({self.max_seconds}s); stopping.")
-                        stop_key_event.set()
-                        break
-                    time.sleep(0.02)
+                max_timer = None
+                if self.max_seconds:
+                    max_timer = threading.Timer(self.max_seconds, self._stop_at_max_seconds, args=(stop_key_event,))
+                    max_timer.daemon = True
+                    max_timer.start()
+                try:
+                    while not self.cancel_event.is_set():
+                        self._tick.clear()
+                        self._drain_commands(stop_key_event)
+                        if stop_key_event.is_set():
+                            break
+                        self._wait_tick()
+                finally:
+                    keys.disarm(stop_key_event)
+                    if max_timer:
+                        max_timer.cancel()
 
                 self._finish_recording_and_generate()
+                # Early returns (empty take, cancel, no output) leave a posted state.
+                self._flush_status()
 
             return 0
 
@@ -775,18 +1270,15 @@ class ManualModeSession:
             return 1
         finally:
             self.cancel_event.set()
-            if self.midi_thread and self.midi_thread.is_alive():
-                self.midi_thread.join(timeout=1.0)
+            if self._keys is not None:
+                self._keys.close()
+                self._keys = None
             self._close_ports()
-
-    @staticmethod
-    def _midi_stats(path: str) -> Tuple[int, float]:
-        import mido
-        mid = mido.MidiFile(path)
-        total_ticks = 0
-        for track in mid.tracks:
-            ticks = 0
-            for msg in track:
-                ticks += getattr(msg, "time", 0)
-            total_ticks = max(total_ticks, ticks)
-        return total_ticks, mid.length
+            if self._io_executor is not None:
+                self._io_executor.shutdown(wait=False)
+                self._io_executor = None
+            if self._tmpdir is not None:
+                self._tmpdir.cleanup()
+                self._tmpdir = None
+            self._log_turnaround_summary()
+            self._stop_log_thread()
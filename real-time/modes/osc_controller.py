@@ -1,14 +1,88 @@
 """Optional OSC control plane for Max for Live integration."""
 
 import logging
+import math
 import threading
 import time
+from contextlib import contextmanager
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+_FLAG_TRUE = frozenset({"1", "true", "True", "on"})
+_FLAG_FALSE = frozenset({"0", "false", "False", "off"})
+
+
+def _as_float(val) -> Optional[float]:
+    """Numeric OSC argument as a finite float, or None. Typed M4L floats skip the try."""
+    if isinstance(val, (int, float)):
+        f = float(val)
+    elif isinstance(val, str):
+        try:
+            f = float(val)
+        except ValueError:
+            return None
+    else:
+        return None
+    return f if math.isfinite(f) else None
+
+
+def _burst_server_class(osc_server, burst: int):
+    """
+    BlockingOSCUDPServer that, after select() reports the socket readable,
+    handles up to `burst` queued datagrams before selecting again. The socket
+    is non-blocking, so an empty queue ends the burst with one EWOULDBLOCK.
+    """
+
+    class _BurstOSCUDPServer(osc_server.BlockingOSCUDPServer):
+        def __init__(self, server_address, dispatcher):
+            super().__init__(server_address, dispatcher)
+            self.socket.setblocking(False)
+
+        def _handle_request_noblock(self):
+            for _ in range(burst):
+                try:
+                    request, client_address = self.get_request()
+                except OSError:
+                    return
+                if not self.verify_request(request, client_address):
+                    self.shutdown_request(request)
+                    continue
+                try:
+                    self.process_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                    self.shutdown_request(request)
+
+    return _BurstOSCUDPServer
+
 
 class OscController:
+    # serve_forever only uses this to notice shutdown(); packets wake select() directly.
+    SERVE_POLL_S = 0.5
+    # Datagrams handled per select() wakeup during a fader sweep.
+    RECV_BURST = 16
+    # Inbound address -> handler method.
+    _ROUTES = (
+        ("/aria/temp", "_handle_temp"),
+        ("/aria/top_p", "_handle_top_p"),
+        ("/aria/min_p", "_handle_min_p"),
+        ("/aria/tokens", "_handle_tokens"),
+        ("/aria/record", "_handle_record"),
+        ("/aria/play", "_handle_play"),
+        ("/aria/ping", "_handle_ping"),
+        ("/aria/cancel", "_handle_cancel"),
+        ("/cancel_playback", "_handle_cancel_playback"),
+        ("/aria/coherence", "_handle_coherence"),
+        ("/aria/repetition", "_handle_repetition"),
+        ("/aria/taste", "_handle_taste"),
+        ("/aria/continuity", "_handle_continuity"),
+        ("/aria/grade", "_handle_grade"),
+        ("/aria/commit", "_handle_commit"),
+    )
+    # After a failed send, skip outbound work this long before trying again.
+    CLIENT_RETRY_S = 1.0
+
     def __init__(
         self,
         host: str,
@@ -37,14 +111,9 @@ class OscController:
         self.stop_event = threading.Event()
         self.thread = None
         self.dispatcher = None
-        # Track initial sync from M4L
+        # Track initial sync from M4L; the condition is notified per value.
         self._startup_lock = threading.Lock()
-        self._startup_events: Dict[str, threading.Event] = {
-            "temp": threading.Event(),
-            "top_p": threading.Event(),
-            "min_p": threading.Event(),
-            "tokens": threading.Event(),
-        }
+        self._startup_cv = threading.Condition(self._startup_lock)
         self._startup_state: Dict[str, Optional[float]] = {
             "temp": None,
             "top_p": None,
@@ -52,60 +121,58 @@ class OscController:
             "tokens": None,
         }
         self._debug_enabled = False
+        # Per-thread outbound batch; set while a handler runs so its sends go out as one bundle.
+        self._out = threading.local()
+        self._client_healthy = True
+        self._client_next_probe = 0.0
+        # Last /aria/params tuple handed to the client; unchanged values are not echoed.
+        self._last_sent_params = None
+        # Prebuilt /aria/status messages; the status vocabulary is a handful of words.
+        self._status_msgs: Dict[str, object] = {}
+        self._message_builder = None
 
     def start(self):
         try:
-            from pythonosc import dispatcher, osc_server, udp_client
+            from pythonosc import dispatcher, osc_message_builder, osc_server, udp_client
         except Exception as e:  # pragma: no cover - optional dep
             logger.error(f"python-osc not available: {e}")
             return
 
         disp = dispatcher.Dispatcher()
-        disp.map("/aria/record", self._handle_record)
-        disp.map("/aria/temp", self._handle_temp)
-        disp.map("/aria/top_p", self._handle_top_p)
-        disp.map("/aria/min_p", self._handle_min_p)
-        disp.map("/aria/tokens", self._handle_tokens)
-        disp.map("/aria/cancel", self._handle_cancel)
-        disp.map("/cancel_playback", self._handle_cancel_playback)
-        disp.map("/aria/ping", self._handle_ping)
-        disp.map("/aria/play", self._handle_play)
-        disp.map("/aria/coherence", self._handle_coherence)
-        disp.map("/aria/repetition", self._handle_repetition)
-        disp.map("/aria/taste", self._handle_taste)
-        disp.map("/aria/continuity", self._handle_continuity)
-        disp.map("/aria/grade", self._handle_grade)
-        disp.map("/aria/commit", self._handle_commit)
+        for address, name in self._ROUTES:
+            disp.map(address, self._bundled_handler(getattr(self, name)))
         self.dispatcher = disp
+        self._message_builder = osc_message_builder.OscMessageBuilder
 
         try:
             # Outbound client remains for status/logs; no startup request is sent.
             self.client = udp_client.SimpleUDPClient(self.host, self.out_port)
-            self.server = osc_server.ThreadingOSCUDPServer((self.host, self.in_port), disp)
-            self.server.timeout = 0.2
+            # Handlers are short and non-blocking (commits go through the feedback
+            # writer thread), so one serving thread dispatches them in order.
+            server_cls = _burst_server_class(osc_server, self.RECV_BURST)
+            self.server = server_cls((self.host, self.in_port), disp)
         except Exception as e:
             logger.error(f"Failed to start OSC server: {e}")
             return
 
         def _serve():
+            # Blocks in select() until a packet arrives; stop() ends it via shutdown().
             logger.info(f"OSC server listening on {self.host}:{self.in_port}")
-            while not self.stop_event.is_set():
-                self.server.handle_request()
+            self.server.serve_forever(poll_interval=self.SERVE_POLL_S)
             logger.info("OSC server stopped")
 
         self.thread = threading.Thread(target=_serve, daemon=True)
         self.thread.start()
 
     def _record_startup_value(self, key: str, value: float | int):
-        # Save first-seen values for startup sync and mark event
-        with self._startup_lock:
+        # Save first-seen values for startup sync and wake the waiter
+        with self._startup_cv:
             self._startup_state[key] = value
-        if key in self._startup_events:
-            self._startup_events[key].set()
+            self._startup_cv.notify_all()
 
-    def _startup_snapshot(self) -> Dict[str, Optional[float]]:
-        with self._startup_lock:
-            return dict(self._startup_state)
+    def _startup_complete(self) -> bool:
+        # Called with _startup_lock held.
+        return all(v is not None for v in self._startup_state.values())
 
     def _enable_debug_logging(self):
         if self.dispatcher and not self._debug_enabled:
@@ -118,7 +185,7 @@ class OscController:
             self._debug_enabled = False
 
     def _debug_handler(self, address, *args):
-        logger.info(f"[OSC][debug] {address} {args}")
+        logger.info("[OSC][debug] %s %s", address, args)
 
     def sync_state_on_startup(self, timeout: float = 3.0) -> Dict[str, Optional[float]]:
         """
@@ -145,13 +212,9 @@ class OscController:
         }
 
         try:
-            deadline = time.time() + timeout
-            while time.time() < deadline:
-                if all(ev.is_set() for ev in self._startup_events.values()):
-                    break
-                time.sleep(0.01)
-
-            snapshot = self._startup_snapshot()
+            with self._startup_cv:
+                self._startup_cv.wait_for(self._startup_complete, timeout=timeout)
+                snapshot = dict(self._startup_state)
             missing = [k for k, v in snapshot.items() if v is None]
 
             temp, top_p, min_p = self.sampling_state.get_values()
@@ -186,6 +249,11 @@ class OscController:
     def stop(self):
         self.stop_event.set()
         if self.server:
+            if self.thread and self.thread.is_alive():
+                try:
+                    self.server.shutdown()
+                except Exception:
+                    pass
             try:
                 self.server.server_close()
             except Exception:
@@ -194,20 +262,110 @@ class OscController:
             self.thread.join(timeout=1)
 
     # Outgoing helpers
+    def _client_down(self) -> bool:
+        return not self._client_healthy and time.monotonic() < self._client_next_probe
+
+    def _client_failed(self) -> None:
+        self._client_healthy = False
+        self._client_next_probe = time.monotonic() + self.CLIENT_RETRY_S
+        self._last_sent_params = None
+
+    def _dropped(self) -> None:
+        # A message skipped during backoff may have been the params echo, so
+        # the next send_params() must not be deduped against it.
+        self._last_sent_params = None
+
+    def _build(self, address: str, value):
+        msg = self._message_builder(address=address)
+        if isinstance(value, (list, tuple)):
+            for arg in value:
+                msg.add_arg(arg)
+        elif value is not None:
+            msg.add_arg(value)
+        return msg.build()
+
+    def _send(self, address: str, value, prebuilt=None) -> None:
+        batch = getattr(self._out, "batch", None)
+        if batch is not None:
+            batch.append((address, value, prebuilt))
+            return
+        if self._client_down():
+            self._dropped()
+            return
+        try:
+            if prebuilt is not None:
+                self.client.send(prebuilt)
+            else:
+                self.client.send_message(address, value)
+        except Exception:
+            self._client_failed()
+            raise
+        self._client_healthy = True
+
+    @contextmanager
+    def _bundled(self):
+        """Collect sends made on this thread and emit them as a single OSC bundle."""
+        if getattr(self._out, "batch", None) is not None:
+            yield
+            return
+        self._out.batch = batch = []
+        try:
+            yield
+        finally:
+            self._out.batch = None
+            self._flush_out(batch)
+
+    def _bundled_handler(self, handler):
+        def _run(addr, *args):
+            with self._bundled():
+                handler(addr, *args)
+
+        return _run
+
+    def _flush_out(self, batch):
+        if not batch or not self.client:
+            return
+        if self._client_down():
+            self._dropped()
+            return
+        try:
+            if len(batch) == 1:
+                address, value, prebuilt = batch[0]
+                self.client.send(prebuilt if prebuilt is not None else self._build(address, value))
+                self._client_healthy = True
+                return
+            from pythonosc.osc_bundle_builder import IMMEDIATELY, OscBundleBuilder
+
+            bundle = OscBundleBuilder(IMMEDIATELY)
+            for address, value, prebuilt in batch:
+                bundle.add_content(prebuilt if prebuilt is not None else self._build(address, value))
+            self.client.send(bundle.build())
+            self._client_healthy = True
+        except Exception:
+            self._client_failed()
+            logger.debug("Failed to send OSC bundle")
+
     def send_status(self, status: str):
         if not self.client:
             return
         try:
-            self.client.send_message("/aria/status", status)
+            msg = self._status_msgs.get(status)
+            if msg is None:
+                msg = self._status_msgs[status] = self._build("/aria/status", status)
+            self._send("/aria/status", status, msg)
         except Exception:
             logger.debug("Failed to send OSC status")
 
-    def send_params(self):
+    def send_params(self, force: bool = False):
+        """Echo the sampling params; skipped when they match the last echo unless `force`."""
         if not self.client:
             return
         try:
-            t, tp, mp = self.sampling_state.get_values()
-            self.client.send_message("/aria/params", [t, tp, mp])
+            values = self.sampling_state.get_values()
+            if not force and values == self._last_sent_params:
+                return
+            self._send("/aria/params", list(values))
+            self._last_sent_params = values
         except Exception:
             logger.debug("Failed to send OSC params")
 
@@ -215,7 +373,7 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/aria/log", msg)
+            self._send("/aria/log", msg)
         except Exception:
             logger.debug("Failed to send OSC log")
 
@@ -223,7 +381,7 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/playback_duration", float(seconds))
+            self._send("/playback_duration", float(seconds))
         except Exception:
             logger.debug("Failed to send /playback_duration")
 
@@ -231,7 +389,7 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/generation_start", [])
+            self._send("/generation_start", [])
         except Exception:
             logger.debug("Failed to send /generation_start")
 
@@ -239,7 +397,7 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/generation_done", [])
+            self._send("/generation_done", [])
         except Exception:
             logger.debug("Failed to send /generation_done")
 
@@ -247,7 +405,7 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/playback_progress", float(value))
+            self._send("/playback_progress", float(value))
         except Exception:
             logger.debug("Failed to send /playback_progress")
 
@@ -255,31 +413,33 @@ class OscController:
         if not self.client:
             return
         try:
-            self.client.send_message("/playback_stopped", [])
+            self._send("/playback_stopped", [])
         except Exception:
             logger.debug("Failed to send /playback_stopped")
 
     @staticmethod
     def _coerce_flag(val):
-        try:
-            # Numeric path
-            f = float(val)
-            return 1 if f >= 0.5 else 0
-        except Exception:
-            pass
+        if isinstance(val, bool):
+            return int(val)
+        if isinstance(val, (int, float)):
+            return 1 if val >= 0.5 else 0
         if isinstance(val, str):
-            if val.strip() in ("1", "true", "True", "on"):
+            s = val.strip()
+            if s in _FLAG_TRUE:
                 return 1
-            if val.strip() in ("0", "false", "False", "off"):
+            if s in _FLAG_FALSE:
                 return 0
-        if isinstance(val, bool):
-            return 1 if val else 0
-        return None
+        # Rare payloads ("0.7", numpy scalars): fall back to float parsing
+        try:
+            return 1 if float(val) >= 0.5 else 0
+        except Exception:
+            return None
 
     # Handlers
     def _handle_record(self, addr, *args):
         # Debug: show raw payload
-        logger.info(f"[OSC] {addr} {args} {type(args[0]) if args else None}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[OSC] %s %s %s", addr, args, type(args[0]) if args else None)
         if not args:
             return
 
@@ -288,23 +448,19 @@ class OscController:
             self.send_log("Invalid /aria/record payload (ignored)")
             return
 
-        snap = self.session_state.get_snapshot()
-        last_level = snap.get("last_record_level")
-        if last_level == flag:
+        outcome = self.session_state.try_transition_record(flag)
+        if outcome == "unchanged":
             self.send_log("Record level unchanged (ignored)")
             return
-        is_recording = snap.get("is_recording")
-        if flag == 1 and is_recording:
+        if outcome == "already_recording":
             self.send_log("Already recording; record=1 ignored")
             logger.info("[OSC] record=1 ignored (already recording)")
             return
-        if flag == 0 and not is_recording:
+        if outcome == "set_only":
             self.send_log("Not recording; record=0 ignored")
             logger.info("[OSC] record=0 ignored (not recording)")
-            self.session_state.set_record_level(flag)
             return
-        self.session_state.set_record_level(flag)
-        if flag == 1:
+        if outcome == "start":
             logger.info("[OSC] record=1 -> START")
             self.command_queue.put(("record_start", None))
             self.send_log("Record start requested (OSC)")
@@ -338,12 +494,11 @@ class OscController:
     def _handle_feedback_param(self, name: str, args):
         if not args:
             return
-        try:
-            val = float(args[0])
-        except Exception:
-            logger.warning(f"Invalid payload for /aria/{name} (ignored)")
+        val = _as_float(args[0])
+        if val is None:
+            logger.warning("Invalid payload for /aria/%s (ignored)", name)
             return
-        logger.info(f"[OSC] {name} -> {val}")
+        logger.info("[OSC] %s -> %s", name, val)
         print(f"STATUS:feedback:{name}:{val:.2f}", flush=True)
         if self.feedback_param_cb:
             self.feedback_param_cb(name, val)
@@ -363,12 +518,12 @@ class OscController:
     def _handle_grade(self, addr, *args):
         if not args:
             return
-        try:
-            grade = int(float(args[0]))
-        except Exception:
+        val = _as_float(args[0])
+        if val is None:
             logger.warning("Invalid /aria/grade payload (ignored)")
             return
-        logger.info(f"[OSC] grade -> {grade}")
+        grade = int(val)
+        logger.info("[OSC] grade -> %s", grade)
         print(f"STATUS:feedback:grade:{grade}", flush=True)
         if self.grade_cb:
             self.grade_cb(grade)
@@ -376,10 +531,8 @@ class OscController:
     def _handle_commit(self, addr, *args):
         flag = 1
         if args:
-            try:
-                flag = int(float(args[0]))
-            except Exception:
-                flag = 0
+            val = _as_float(args[0])
+            flag = int(val) if val is not None else 0
         if flag >= 1:
             logger.info("[OSC] commit received")
             print("STATUS:feedback:commit", flush=True)
@@ -391,52 +544,51 @@ class OscController:
     def _handle_temp(self, addr, *args):
         if not args:
             return
-        try:
-            v = round(float(args[0]), 2)
-        except Exception:
+        v = _as_float(args[0])
+        if v is None:
             return
-        logger.info(f"Received /aria/temp: {v:.2f}")
-        self.sampling_state.set_temperature(v)
+        v = round(v, 2)
+        logger.info("Received /aria/temp: %.2f", v)
+        stored = self.sampling_state.set_temperature(v)
         self._record_startup_value("temp", v)
         self.send_params()
-        self.send_log(f"Temp -> {self.sampling_state.get_values()[0]:.2f}")
+        self.send_log(f"Temp -> {stored:.2f}")
         print(f"STATUS:param:temp:{v:.2f}", flush=True)
 
     def _handle_top_p(self, addr, *args):
         if not args:
             return
-        try:
-            v = round(float(args[0]), 2)
-        except Exception:
+        v = _as_float(args[0])
+        if v is None:
             return
-        logger.info(f"Received /aria/top_p: {v:.2f}")
-        self.sampling_state.set_top_p(v)
+        v = round(v, 2)
+        logger.info("Received /aria/top_p: %.2f", v)
+        stored = self.sampling_state.set_top_p(v)
         self._record_startup_value("top_p", v)
         self.send_params()
-        self.send_log(f"Top_p -> {self.sampling_state.get_values()[1]:.2f}")
+        self.send_log(f"Top_p -> {stored:.2f}")
         print(f"STATUS:param:top_p:{v:.2f}", flush=True)
 
     def _handle_min_p(self, addr, *args):
         if not args:
             return
-        try:
-            v = round(float(args[0]), 2)
-        except Exception:
+        v = _as_float(args[0])
+        if v is None:
             return
-        logger.info(f"Received /aria/min_p: {v:.2f}")
-        self.sampling_state.set_min_p(v)
+        v = round(v, 2)
+        logger.info("Received /aria/min_p: %.2f", v)
+        stored = self.sampling_state.set_min_p(v)
         self._record_startup_value("min_p", v)
         self.send_params()
-        self.send_log(f"Min_p -> {self.sampling_state.get_values()[2]:.2f}")
+        self.send_log(f"Min_p -> {stored:.2f}")
         print(f"STATUS:param:min_p:{v:.2f}", flush=True)
 
     def _handle_tokens(self, addr, *args):
-        logger.info(f"Received /aria/tokens: {args[0] if args else 'None'}")
+        logger.info("Received /aria/tokens: %s", args[0] if args else None)
         if not args:
             return
-        try:
-            v = float(args[0])
-        except Exception:
+        v = _as_float(args[0])
+        if v is None:
             self.send_log("Invalid /aria/tokens payload (ignored)")
             return
         # Clamp to integer range 0-2048
@@ -448,4 +600,4 @@ class OscController:
 
     def _handle_ping(self, addr, *args):
         self.send_status(self.session_state.get_snapshot().get("status", "UNKNOWN"))
-        self.send_params()
+        self.send_params(force=True)
@@ -2,7 +2,6 @@
 
 import logging
 import threading
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -31,28 +30,31 @@ def _listener_loop(sampling_state, stop_event: threading.Event):
 
         hook = keyboard.on_press(on_key)
         logger.info("Sampling hotkeys active (1/2 temp, 3/4 top_p, 5/6 min_p)")
-        while not stop_event.is_set():
-            time.sleep(0.1)
+        stop_event.wait()
         keyboard.unhook(hook)
         return
     except Exception:
         pass  # fall back to msvcrt / polling
 
-    # Fallback for Windows without keyboard lib
+    # Fallback for Windows without keyboard lib: share manual mode's blocking
+    # getwch() reader so the two listeners don't steal each other's keys.
     try:
-        import msvcrt  # type: ignore
+        from modes.manual_mode import _console_keys
 
-        logger.info("Sampling hotkeys (msvcrt): 1/2 temp, 3/4 top_p, 5/6 min_p")
-        while not stop_event.is_set():
-            if msvcrt.kbhit():
-                ch = msvcrt.getwch()
-                _maybe_handle(ch.upper(), sampling_state)
-            time.sleep(0.05)
-        return
+        reader = _console_keys()
     except Exception:
         logger.warning("Sampling hotkeys disabled (no keyboard backend available)")
         return
 
+    def on_char(ch: str):
+        if not stop_event.is_set():
+            _maybe_handle(ch.upper(), sampling_state)
+
+    reader.add_handler(on_char)
+    logger.info("Sampling hotkeys (msvcrt): 1/2 temp, 3/4 top_p, 5/6 min_p")
+    stop_event.wait()
+    reader.remove_handler(on_char)
+
 
 def _maybe_handle(key: str, sampling_state):
     if key == "2":
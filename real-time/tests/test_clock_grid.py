@@ -5,16 +5,18 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from clock_grid import ClockGrid
+from modes.clock_mode import PPQN, ClockGrid  # noqa: E402
 
 
 def test_pulse_counts_4_4():
-    grid = ClockGrid(clock_port_name="ARIA_CLOCK", measures=2, beats_per_bar=4)
-    assert grid.get_pulses_per_bar() == 96
-    assert grid.get_pulses_per_block() == 192
+    assert ClockGrid.compute_pulses(PPQN, 4, 2) == (96, 192)
 
 
 def test_pulse_counts_3_4():
-    grid = ClockGrid(clock_port_name="ARIA_CLOCK", measures=3, beats_per_bar=3)
-    assert grid.get_pulses_per_bar() == 72
-    assert grid.get_pulses_per_block() == 216
\ No newline at end of file
+    assert ClockGrid.compute_pulses(PPQN, 3, 3) == (72, 216)
+
+
+def test_grid_uses_computed_pulses():
+    grid = ClockGrid(clock_port_name="ARIA_CLOCK", measures=2, beats_per_bar=4)
+    assert grid.get_pulses_per_bar() == 96
+    assert grid.get_pulses_per_block() == 192
@@ -0,0 +1,96 @@
+"""Pytest checks for the feedback DataStore index and episode files."""
+
+import csv
+import gc
+import json
+import sys
+import weakref
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.datastore import DataStore  # noqa: E402
+
+
+def _read_index(store):
+    with store.index_path.open("r", newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_create_and_finalize_episode(tmp_path):
+    store = DataStore(tmp_path)
+    params = {"temperature": 0.9, "top_p": 0.95, "min_p": 0.0, "max_tokens": 512, "seed": None}
+    first = store.create_episode(b"prompt", b"output", params, mode="manual")
+    second = store.create_episode(b"prompt2", b"output2", params, mode="clock")
+
+    assert store.find_most_recent_draft_episode() == second
+
+    store.finalize_episode(first, 4, feedback={"coherence": 0.5, "taste": 1.0})
+
+    rows = _read_index(store)
+    assert rows[0] == DataStore.INDEX_HEADER
+    by_id = {row[0]: row for row in rows[1:]}
+    assert by_id[first][2:5] == ["final", "4", "0.5"]
+    assert by_id[first][6] == "1.0"
+    assert by_id[second][2] == "draft"
+
+    meta_path = next(store.episodes_dir.rglob(f"{first}/meta.json"))
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    assert meta["status"] == "final"
+    assert meta["grade"] == 4
+    assert meta["coherence"] == 0.5
+
+    # A fresh store sees the same index state from disk.
+    reopened = DataStore(tmp_path)
+    assert reopened.find_most_recent_draft_episode() == second
+
+
+def test_legacy_index_is_migrated(tmp_path):
+    legacy_header = [
+        "episode_id", "timestamp_local", "status", "grade", "temperature",
+        "top_p", "min_p", "max_tokens", "seed", "mode",
+    ]
+    with (tmp_path / "index.csv").open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(legacy_header)
+        writer.writerow(["20240101_000000_abcdef", "t", "draft", "", "0.8", "0.9", "0.0", "256", "", "manual"])
+
+    store = DataStore(tmp_path)
+    rows = _read_index(store)
+    assert rows[0] == DataStore.INDEX_HEADER
+    assert rows[1][0] == "20240101_000000_abcdef"
+    assert rows[1][8] == "0.8"
+    assert rows[1][13] == "manual"
+    assert store.find_most_recent_draft_episode() == "20240101_000000_abcdef"
+
+
+def test_buffered_rows_are_flushed(tmp_path):
+    store = DataStore(tmp_path)
+    episode_id = store.create_episode(b"p", b"o", {}, mode="manual")
+    assert len(_read_index(store)) == 1
+
+    store.flush()
+    rows = _read_index(store)
+    assert [row[0] for row in rows[1:]] == [episode_id]
+
+
+def test_exit_flush_does_not_keep_store_alive(tmp_path):
+    store = DataStore(tmp_path)
+    ref = weakref.ref(store)
+    del store
+    gc.collect()
+    assert ref() is None
+
+
+def test_finalize_finds_episode_in_other_date_folder(tmp_path):
+    store = DataStore(tmp_path)
+    episode_id = store.create_episode(b"p", b"o", {}, mode="manual")
+    src = next(store.episodes_dir.glob(f"*/{episode_id}"))
+    moved = store.episodes_dir / "legacy" / episode_id
+    moved.parent.mkdir()
+    src.rename(moved)
+
+    store = DataStore(tmp_path)
+    store.finalize_episode(episode_id, 2)
+    meta = json.loads((moved / "meta.json").read_text(encoding="utf-8"))
+    assert meta["status"] == "final"
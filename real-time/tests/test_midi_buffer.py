@@ -0,0 +1,45 @@
+"""Pytest checks for the struct-of-arrays capture buffer."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.midi_buffer import CONTROL_CHANGE, NOTE_OFF, NOTE_ON, CaptureBuffer  # noqa: E402
+
+
+def test_append_grows_past_capacity():
+    buf = CaptureBuffer(2)
+    for i in range(300):
+        buf.append(i * 1000, NOTE_ON, 60, 100)
+    assert len(buf) == 300
+    assert buf.ts_us[299] == 299_000
+
+
+def test_onsets_and_messages():
+    buf = CaptureBuffer(8)
+    buf.append(0, NOTE_ON, 60, 90)
+    buf.append(250_000, NOTE_OFF, 60, 0)
+    buf.append(300_000, CONTROL_CHANGE, 64, 127)
+    buf.append(500_000, NOTE_ON, 62, 0)
+    buf.append(750_000, NOTE_ON, 64, 80)
+
+    assert list(buf.onset_times()) == [0.0, 0.75]
+
+    msgs = buf.to_messages()
+    assert [m.msg_type for m in msgs] == ["note_on", "note_off", "control_change", "note_on", "note_on"]
+    assert (msgs[2].control, msgs[2].value, msgs[2].note) == (64, 127, None)
+    assert msgs[4].timestamp == 0.75
+
+    buf.truncate(2)
+    assert len(buf.to_messages()) == 2
+
+
+def test_truncate_after_keeps_events_up_to_cutoff():
+    buf = CaptureBuffer(4)
+    for ts in (0, 100, 200, 200, 300):
+        buf.append(ts, NOTE_ON, 60, 1)
+    buf.truncate_after(200)
+    assert len(buf) == 4
+    buf.truncate_after(-1)
+    assert len(buf) == 0
@@ -1,11 +1,20 @@
 """Optional Tkinter UI panel for live control and status."""
 
+import logging
 import queue
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
 
+logger = logging.getLogger(__name__)
+
+# Poll quickly while log lines or state changes are arriving, back off to POLL_IDLE_MS when quiet.
+POLL_ACTIVE_MS = 100
+POLL_IDLE_MS = 500
+# Oldest log lines are dropped past this many.
+MAX_LOG_LINES = 1000
+
 
 def run_ui(sampling_state, session_state, cmd_queue: queue.Queue, log_queue: queue.Queue, stop_event: threading.Event):
     root = tk.Tk()
@@ -18,14 +27,23 @@ def run_ui(sampling_state, session_state, cmd_queue: queue.Queue, log_queue: que
     top_p_var = tk.StringVar()
     min_p_var = tk.StringVar()
 
+    shown = [None]
+
     def refresh_labels():
+        """Update the labels if anything changed; returns whether it did."""
         snap = session_state.get_snapshot()
+        values = sampling_state.get_values()
+        key = (snap["mode"], snap["status"], values)
+        if key == shown[0]:
+            return False
+        shown[0] = key
+        t, tp, mp = values
         mode_var.set(f"Mode: {snap['mode']}")
         status_var.set(f"Status: {snap['status']}")
-        t, tp, mp = sampling_state.get_values()
         temp_var.set(f"Temp: {t:.2f}")
         top_p_var.set(f"Top-p: {tp:.2f}")
         min_p_var.set(f"Min-p: {mp:.2f}")
+        return True
 
     # Layout
     ttk.Label(root, textvariable=mode_var, font=("Segoe UI", 11, "bold")).pack(anchor="w", padx=8, pady=(8, 2))
@@ -42,21 +60,29 @@ def run_ui(sampling_state, session_state, cmd_queue: queue.Queue, log_queue: que
 
     def log(msg):
         log_queue.put(msg)
-        import logging
-        logging.getLogger(__name__).info(msg)
+        logger.info(msg)
 
     def wrap(cmd, payload=None):
         cmd_queue.put((cmd, payload))
+        schedule_poll(POLL_ACTIVE_MS)
 
     ttk.Button(btns, text="Record (r)", command=lambda: wrap("toggle_record")).grid(row=0, column=0, sticky="ew", padx=2, pady=2)
     ttk.Button(btns, text="Play Last (p)", command=lambda: wrap("play_last")).grid(row=0, column=1, sticky="ew", padx=2, pady=2)
 
-    ttk.Button(btns, text="Temp +", command=lambda: (sampling_state.increase_temperature(), log_change())).grid(row=1, column=0, sticky="ew", padx=2, pady=2)
-    ttk.Button(btns, text="Temp -", command=lambda: (sampling_state.decrease_temperature(), log_change())).grid(row=1, column=1, sticky="ew", padx=2, pady=2)
-    ttk.Button(btns, text="Top-p +", command=lambda: (sampling_state.increase_top_p(), log_change())).grid(row=2, column=0, sticky="ew", padx=2, pady=2)
-    ttk.Button(btns, text="Top-p -", command=lambda: (sampling_state.decrease_top_p(), log_change())).grid(row=2, column=1, sticky="ew", padx=2, pady=2)
-    ttk.Button(btns, text="Min-p +", command=lambda: (sampling_state.increase_min_p(), log_change())).grid(row=3, column=0, sticky="ew", padx=2, pady=2)
-    ttk.Button(btns, text="Min-p -", command=lambda: (sampling_state.decrease_min_p(), log_change())).grid(row=3, column=1, sticky="ew", padx=2, pady=2)
+    def adjust(step):
+        # Apply a +/- step, log it and update the labels right away.
+        step()
+        t, tp, mp = sampling_state.get_values()
+        log(f"[SAMPLING] temp={t:.2f} top_p={tp:.2f} min_p={mp:.2f}")
+        refresh_labels()
+        schedule_poll(POLL_ACTIVE_MS)
+
+    ttk.Button(btns, text="Temp +", command=lambda: adjust(sampling_state.increase_temperature)).grid(row=1, column=0, sticky="ew", padx=2, pady=2)
+    ttk.Button(btns, text="Temp -", command=lambda: adjust(sampling_state.decrease_temperature)).grid(row=1, column=1, sticky="ew", padx=2, pady=2)
+    ttk.Button(btns, text="Top-p +", command=lambda: adjust(sampling_state.increase_top_p)).grid(row=2, column=0, sticky="ew", padx=2, pady=2)
+    ttk.Button(btns, text="Top-p -", command=lambda: adjust(sampling_state.decrease_top_p)).grid(row=2, column=1, sticky="ew", padx=2, pady=2)
+    ttk.Button(btns, text="Min-p +", command=lambda: adjust(sampling_state.increase_min_p)).grid(row=3, column=0, sticky="ew", padx=2, pady=2)
+    ttk.Button(btns, text="Min-p -", command=lambda: adjust(sampling_state.decrease_min_p)).grid(row=3, column=1, sticky="ew", padx=2, pady=2)
 
     for c in range(2):
         btns.grid_columnconfigure(c, weight=1)
@@ -64,31 +90,47 @@ def run_ui(sampling_state, session_state, cmd_queue: queue.Queue, log_queue: que
     log_box = tk.Text(root, height=12, state="disabled", wrap="word")
     log_box.pack(fill="both", expand=True, padx=8, pady=8)
 
-    def append_log(msg):
+    def append_logs(msgs):
+        # One insert/trim/scroll per poll, however many lines were queued.
         log_box.configure(state="normal")
-        log_box.insert("end", msg + "\n")
+        log_box.insert("end", "\n".join(msgs) + "\n")
+        excess = int(log_box.index("end-1c").split(".")[0]) - 1 - MAX_LOG_LINES
+        if excess > 0:
+            log_box.delete("1.0", f"{excess + 1}.0")
         log_box.see("end")
         log_box.configure(state="disabled")
 
-    def log_change():
-        t, tp, mp = sampling_state.get_values()
-        log(f"[SAMPLING] temp={t:.2f} top_p={tp:.2f} min_p={mp:.2f}")
+    # Tk calls must stay on this thread, so producers are not asked to wake the
+    # loop; instead the poll interval stretches while nothing is happening.
+    poll_state = {"delay": POLL_ACTIVE_MS, "after": None}
+
+    def schedule_poll(delay_ms):
+        poll_state["delay"] = delay_ms
+        if poll_state["after"] is not None:
+            root.after_cancel(poll_state["after"])
+        poll_state["after"] = root.after(delay_ms, poll)
 
     def poll():
+        poll_state["after"] = None
         if stop_event.is_set():
             root.quit()
             return
-        refresh_labels()
+        changed = refresh_labels()
+        msgs = []
         try:
             while True:
-                msg = log_queue.get_nowait()
-                append_log(msg)
+                msgs.append(log_queue.get_nowait())
         except queue.Empty:
             pass
-        root.after(100, poll)
+        if msgs:
+            append_logs(msgs)
+        if msgs or changed:
+            schedule_poll(POLL_ACTIVE_MS)
+        else:
+            schedule_poll(min(poll_state["delay"] * 2, POLL_IDLE_MS))
 
     refresh_labels()
-    root.after(100, poll)
+    schedule_poll(POLL_ACTIVE_MS)
 
     def on_key(event):
         ks = event.keysym.lower()